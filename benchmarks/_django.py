@@ -0,0 +1,50 @@
+"""Общая подготовка Django для скриптов бенчмарков.
+
+Скрипты запускаются из корня репозитория: `python benchmarks/<name>.py`.
+Каждый работает на временной тестовой базе и не трогает `db.sqlite3`.
+"""
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'yatube_api'
+sys.path.insert(0, str(PROJECT_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+
+@contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment, teardown_test_environment
+    )
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timed(func, repeat=20):
+    """Медиана времени выполнения func в миллисекундах."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def make_user(username='bench'):
+    from django.contrib.auth import get_user_model
+    return get_user_model().objects.create_user(username=username)
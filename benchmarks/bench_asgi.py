@@ -0,0 +1,122 @@
+"""Пропускная способность списка постов и комментариев: WSGI и ASGI.
+
+Сравниваются синхронный WSGI-воркер (один запрос за раз), WSGI с пулом
+из CONCURRENCY потоков и ASGI с CONCURRENCY одновременными запросами на
+одном event loop: с обычными синхронными view, которые Django выполняет
+по одному в общем потоке, и с асинхронными (API_ASYNC_VIEWS=true). Запросы идут
+через обработчики Django в процессе, без сетевого сервера. Каждый режим
+запускается в отдельном процессе: view выбираются при импорте URL.
+
+На SQLite в памяти ожидания ввода-вывода почти нет, и выигрыш ASGI
+проявляется слабо; с PostgreSQL (DB_ENGINE=postgresql) запросы
+ждут сеть, и разница видна лучше.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+CONCURRENCY = 16
+REQUESTS = 400
+COUNT = 100
+
+
+def wsgi_rate(path, headers, workers):
+    from django.test import Client
+
+    local = threading.local()
+
+    def request(_):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+        response = local.client.get(path, **headers)
+        assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(request, range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def asgi_rate(path, headers):
+    from django.test import AsyncClient
+
+    headers = {
+        key[len('HTTP_'):]: value for key, value in headers.items()
+    }
+
+    async def run():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def request():
+            async with semaphore:
+                response = await client.get(path, **headers)
+            assert response.status_code == 200, response.status_code
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(REQUESTS)))
+        return REQUESTS / (time.perf_counter() - start)
+
+    return asyncio.run(run())
+
+
+def serve(mode):
+    from _django import make_user, test_database
+    from rest_framework.authtoken.models import Token
+
+    from posts.models import Comment, Post
+
+    with test_database():
+        author = make_user()
+        headers = {
+            'HTTP_AUTHORIZATION':
+                f'Token {Token.objects.create(user=author).key}'
+        }
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}. ' * 10, author=author)
+            for i in range(COUNT)
+        )
+        post = Post.objects.first()
+        Comment.objects.bulk_create(
+            Comment(text=f'Комментарий {i}', author=author, post=post)
+            for i in range(COUNT)
+        )
+        paths = (
+            ('posts', '/api/v1/posts/'),
+            ('comments', f'/api/v1/posts/{post.pk}/comments/'),
+        )
+        for name, path in paths:
+            if mode == 'asgi':
+                rates = {'ASGI, async view': asgi_rate(path, headers)}
+            elif mode == 'asgi-sync':
+                rates = {'ASGI, sync view': asgi_rate(path, headers)}
+            else:
+                rates = {
+                    'WSGI, 1 поток': wsgi_rate(path, headers, 1),
+                    f'WSGI, {CONCURRENCY} потоков':
+                        wsgi_rate(path, headers, CONCURRENCY),
+                }
+            for label, rate in rates.items():
+                print(f'{name:<9} {label:<18} {rate:7.0f} req/s')
+
+
+def main():
+    print(f'{REQUESTS} запросов, до {CONCURRENCY} одновременно')
+    for mode in ('wsgi', 'asgi-sync', 'asgi'):
+        env = dict(
+            os.environ, API_ASYNC_VIEWS='true' if mode == 'asgi' else 'false'
+        )
+        subprocess.run(
+            [sys.executable, __file__, mode], env=env, check=True
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        serve(sys.argv[1])
+    else:
+        main()
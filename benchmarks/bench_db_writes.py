@@ -0,0 +1,100 @@
+"""Конкурентная запись постов: пропускная способность базы данных.
+
+Каждый поток имитирует запросы API: сигналы request_started и
+request_finished вокруг создания поста, как в обработчике Django, так что
+CONN_MAX_AGE и проверка соединений работают как на сервере.
+
+SQLite сравнивается с настройками по умолчанию (rollback journal,
+synchronous=full) и с settings.SQLITE_PRAGMAS в режиме WAL на файловой
+базе.
+Для PostgreSQL (DB_ENGINE=postgresql) сравниваются новое соединение на
+каждый запрос и постоянные соединения.
+"""
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from _django import make_user, test_database
+
+WRITERS = 8
+PER_WRITER = 200
+
+
+def write_load(author):
+    from django.core.signals import request_finished, request_started
+    from django.db import OperationalError, connection
+
+    from posts.models import Post
+
+    # Смена journal_mode требует, чтобы других соединений с файлом не было.
+    connection.close()
+    errors = []
+
+    def writer(number):
+        for i in range(PER_WRITER):
+            request_started.send(sender=None)
+            try:
+                Post.objects.create(text=f'{number}-{i}', author=author)
+            except OperationalError:
+                errors.append(1)
+            finally:
+                request_finished.send(sender=None)
+        connection.close()
+
+    threads = [
+        threading.Thread(target=writer, args=(number,))
+        for number in range(WRITERS)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return (WRITERS * PER_WRITER - len(errors)) / elapsed, len(errors)
+
+
+def report(name, result):
+    rate, errors = result
+    print(f'{name:<28} {rate:8.0f} posts/s, ошибок: {errors}')
+
+
+def bench_sqlite(settings, database):
+    tuned = {**settings.SQLITE_PRAGMAS, 'journal_mode': 'wal'}
+    with tempfile.TemporaryDirectory() as directory:
+        database['TEST']['NAME'] = str(Path(directory) / 'bench.sqlite3')
+        with test_database():
+            author = make_user()
+            settings.SQLITE_PRAGMAS = {
+                'journal_mode': 'delete', 'synchronous': 'full'
+            }
+            report('sqlite, по умолчанию', write_load(author))
+            settings.SQLITE_PRAGMAS = tuned
+            report('sqlite, WAL + pragmas', write_load(author))
+
+
+def bench_postgresql(database):
+    max_age = database['CONN_MAX_AGE']
+    with test_database():
+        author = make_user()
+        database['CONN_MAX_AGE'] = 0
+        report('postgresql, CONN_MAX_AGE=0', write_load(author))
+        database['CONN_MAX_AGE'] = max_age
+        report(f'postgresql, CONN_MAX_AGE={max_age}', write_load(author))
+
+
+def main():
+    from django.conf import settings
+    from django.db import connection
+
+    database = connection.settings_dict
+    print(f'{WRITERS} потоков по {PER_WRITER} записей')
+    if connection.vendor == 'sqlite':
+        bench_sqlite(settings, database)
+    else:
+        bench_postgresql(database)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Рендеринг списка из 1000 постов: JSONRenderer против FastJSONRenderer.
+
+Без установленного orjson FastJSONRenderer совпадает с JSONRenderer.
+"""
+from _django import make_user, test_database, timed
+
+COUNT = 1_000
+
+
+def main():
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api import renderers
+    from api.serializers import PostSerializer
+    from posts.models import Group, Post
+
+    with test_database():
+        author = make_user()
+        group = Group.objects.create(title='Группа', slug='group')
+        Post.objects.bulk_create(
+            Post(
+                text=f'Пост номер {i}. ' * 20, author=author, group=group,
+                image=f'posts/{i}.jpg'
+            )
+            for i in range(COUNT)
+        )
+        context = {
+            'request': Request(APIRequestFactory().get('/api/v1/posts/'))
+        }
+        payload = PostSerializer(
+            Post.objects.select_related('author'), many=True, context=context
+        ).data
+
+        stdlib = JSONRenderer()
+        fast = renderers.FastJSONRenderer()
+        assert stdlib.render(payload) == fast.render(payload)
+
+        stdlib_ms = timed(lambda: stdlib.render(payload), repeat=50)
+        fast_ms = timed(lambda: fast.render(payload), repeat=50)
+        encoder = 'orjson' if renderers.orjson else 'json (orjson не найден)'
+        print(f'payload: {len(stdlib.render(payload))} bytes, {encoder}')
+        print(f'JSONRenderer:     {stdlib_ms:.2f} ms')
+        print(f'FastJSONRenderer: {fast_ms:.2f} ms')
+        print(f'speedup:          {stdlib_ms / fast_ms:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
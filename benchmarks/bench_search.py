@@ -0,0 +1,53 @@
+"""Задержка `?search=` в зависимости от числа постов.
+
+FTS-индекс отвечает за время, зависящее от числа совпадений, а не от
+размера таблицы; для сравнения приведён `icontains` (LIKE '%...%').
+"""
+import random
+
+from _django import make_user, test_database, timed
+
+SIZES = (1_000, 10_000, 100_000)
+WORDS = (
+    'кот собака дом лес река поле город небо море гора дождь снег '
+    'солнце ветер книга окно дверь стол'
+).split()
+RARE_WORD = 'жираф'
+
+
+def fill(author, count, start):
+    from posts.models import Post
+
+    rng = random.Random(start)
+    posts = []
+    for i in range(start, start + count):
+        words = rng.choices(WORDS, k=12)
+        if i % 1000 == 0:
+            words.append(RARE_WORD)
+        posts.append(Post(text=' '.join(words), author=author))
+    Post.objects.bulk_create(posts, batch_size=5000)
+
+
+def main():
+    from posts.models import Post
+    from posts.search import search_posts
+
+    with test_database():
+        author = make_user()
+        total = 0
+        print(f'{"posts":>8} {"matches":>8} {"fts, ms":>9} {"like, ms":>9}')
+        for size in SIZES:
+            fill(author, size - total, total)
+            total = size
+            fts = timed(lambda: list(
+                search_posts(Post.objects.all(), RARE_WORD).values('id')
+            ))
+            like = timed(lambda: list(
+                Post.objects.filter(text__icontains=RARE_WORD).values('id')
+            ))
+            matches = search_posts(Post.objects.all(), RARE_WORD).count()
+            print(f'{size:>8} {matches:>8} {fts:>9.2f} {like:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
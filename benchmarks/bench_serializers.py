@@ -0,0 +1,67 @@
+"""Сериализация 10 000 объектов: ModelSerializer против ValuesSerializer.
+
+Время включает запрос к БД и рендеринг в JSON, как в реальном list.
+"""
+from _django import make_user, test_database, timed
+
+COUNT = 10_000
+
+
+def main():
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api.fast_serializers import ValuesSerializer
+    from api.serializers import (
+        CommentSerializer, GroupSerializer, PostSerializer
+    )
+    from posts.models import Comment, Group, Post
+
+    with test_database():
+        author = make_user()
+        group = Group.objects.create(title='Группа', slug='group')
+        Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'group-{i}', description='-')
+            for i in range(COUNT)
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Пост номер {i}', author=author, group=group)
+            for i in range(COUNT)
+        )
+        post = Post.objects.first()
+        Comment.objects.bulk_create(
+            Comment(text=f'Комментарий {i}', author=author, post=post)
+            for i in range(COUNT)
+        )
+
+        context = {
+            'request': Request(APIRequestFactory().get('/api/v1/posts/'))
+        }
+        renderer = JSONRenderer()
+        cases = (
+            ('posts', PostSerializer,
+             Post.objects.select_related('author', 'group')),
+            ('comments', CommentSerializer,
+             Comment.objects.select_related('author')),
+            ('groups', GroupSerializer, Group.objects.all()),
+        )
+        print(f'{"":>10} {"regular, ms":>12} {"fast, ms":>10} {"speedup":>8}')
+        for name, serializer_class, queryset in cases:
+            fast = ValuesSerializer.for_serializer(
+                serializer_class(context=context)
+            )
+            regular_ms = timed(lambda: renderer.render(serializer_class(
+                queryset.all(), many=True, context=context
+            ).data), repeat=5)
+            fast_ms = timed(lambda: renderer.render(
+                fast.to_representation(fast.values(queryset.all()))
+            ), repeat=5)
+            print(
+                f'{name:>10} {regular_ms:>12.1f} {fast_ms:>10.1f} '
+                f'{regular_ms / fast_ms:>7.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
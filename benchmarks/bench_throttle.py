@@ -0,0 +1,55 @@
+"""Стоимость проверки лимитов на запрос: SimpleRateThrottle и token bucket.
+
+Проверяются все три ограничителя API (anon, user, write) на
+POST-запросе пользователя с кэшем из настроек (по умолчанию
+LocMemCache). SimpleRateThrottle хранит историю запросов окна, поэтому
+его стоимость растёт с лимитом, а у token bucket она постоянна.
+"""
+from _django import timed
+
+RATE = '10000/min'
+CHECKS = 1000
+
+
+def main():
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+    from rest_framework.test import APIRequestFactory
+    from rest_framework.throttling import UserRateThrottle
+
+    from api import throttling
+
+    for scope in ('anon', 'user', 'write'):
+        api_settings.DEFAULT_THROTTLE_RATES[scope] = RATE
+    request = Request(APIRequestFactory().post('/api/v1/posts/'))
+    request.user = User(pk=1, username='bench')
+
+    class SimpleUserThrottle(UserRateThrottle):
+        rate = RATE
+
+    buckets = (
+        throttling.AnonBucketThrottle, throttling.UserBucketThrottle,
+        throttling.WriteBucketThrottle,
+    )
+
+    def check(classes):
+        def run():
+            for _ in range(CHECKS):
+                for throttle_class in classes:
+                    throttle_class().allow_request(request, None)
+        return run
+
+    for name, classes in (
+        ('SimpleRateThrottle (user)', (SimpleUserThrottle,)),
+        ('token bucket (anon+user+write)', buckets),
+    ):
+        cache.clear()
+        check(classes)()  # заполняем окно/ведро
+        per_request = timed(check(classes), repeat=5) / CHECKS * 1000
+        print(f'{name:<32} {per_request:6.1f} µs/запрос')
+
+
+if __name__ == '__main__':
+    main()
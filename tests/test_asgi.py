@@ -0,0 +1,99 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.test import AsyncClient
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.views import CommentViewSet, PostViewSet
+
+
+class TestAsgi:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_asgi_application(self, token, post, monkeypatch):
+        monkeypatch.setenv('API_ASYNC_VIEWS', 'false')
+        from yatube_api.asgi import application  # noqa: F401
+
+        async def get():
+            return await AsyncClient().get(
+                '/api/v1/posts/', authorization=f'Token {token}'
+            )
+
+        response = async_to_sync(get)()
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что API работает под ASGI.'
+        )
+        assert response.json()[0]['text'] == post.text
+
+    @pytest.mark.django_db(transaction=True)
+    def test_streaming_export(self, token, post, comment_1_post):
+        from yatube_api.asgi import application
+
+        async def get():
+            communicator = ApplicationCommunicator(application, {
+                'type': 'http',
+                'method': 'GET',
+                'path': '/api/v1/export/posts/',
+                'query_string': b'',
+                'headers': [
+                    (b'authorization', f'Token {token}'.encode()),
+                ],
+            })
+            await communicator.send_input({'type': 'http.request'})
+            start = await communicator.receive_output(timeout=5)
+            body = b''
+            while True:
+                message = await communicator.receive_output(timeout=5)
+                body += message.get('body', b'')
+                if not message.get('more_body'):
+                    return start, body
+
+        start, body = async_to_sync(get)()
+        assert start['status'] == HTTPStatus.OK, (
+            'Проверьте, что выгрузка постов работает под ASGI.'
+        )
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        assert [row['id'] for row in rows] == [post.id]
+        assert rows[0]['comments'][0]['id'] == comment_1_post.id
+
+    @pytest.mark.django_db(transaction=True)
+    def test_async_read_views(self, settings, user, post, comment_1_post):
+        settings.API_ASYNC_VIEWS = True
+        post_list = PostViewSet.as_view({'get': 'list', 'post': 'create'})
+        comment_detail = CommentViewSet.as_view({'get': 'retrieve'})
+        assert asyncio.iscoroutinefunction(post_list), (
+            'Проверьте, что при API_ASYNC_VIEWS view вьюсетов асинхронные.'
+        )
+        assert post_list.cls is PostViewSet
+
+        factory = APIRequestFactory()
+        list_request = factory.get('/api/v1/posts/')
+        detail_request = factory.get(
+            f'/api/v1/posts/{post.id}/comments/{comment_1_post.id}/'
+        )
+        create_request = factory.post(
+            '/api/v1/posts/', {'text': 'Новый'}, format='json'
+        )
+        for request in (list_request, detail_request, create_request):
+            force_authenticate(request, user)
+
+        async def gather():
+            return await asyncio.gather(
+                post_list(list_request),
+                comment_detail(
+                    detail_request, post_id=str(post.id),
+                    pk=str(comment_1_post.id)
+                ),
+                post_list(create_request),
+            )
+
+        posts, comment, created = async_to_sync(gather)()
+        assert posts.status_code == HTTPStatus.OK
+        assert posts.is_rendered
+        assert [item['id'] for item in posts.data] == [post.id]
+        assert comment.data['text'] == comment_1_post.text
+        assert created.status_code == HTTPStatus.CREATED
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+
+class TestBatchRetrieve:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_ids_in_requested_order(self, user_client, post, post_2,
+                                    another_post):
+        ids = [another_post.id, post.id, 9999, post_2.id, post.id]
+        url = '/api/v1/posts/?ids=' + ','.join(map(str, ids))
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [
+            another_post.id, post.id, post_2.id
+        ], 'Проверьте, что посты возвращаются в порядке из `ids`.'
+        assert data['missing'] == [9999], (
+            'Проверьте, что отсутствующие id перечислены в `missing`.'
+        )
+        assert data['results'][0] == user_client.get(
+            f'/api/v1/posts/{another_post.id}/'
+        ).json(), 'Проверьте, что посты совпадают с ответом retrieve.'
+        post_queries = [sql for sql in queries if 'FROM "posts_post"' in sql]
+        assert len(post_queries) == 1, (
+            'Проверьте, что посты выбираются одним запросом.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_sparse_fields(self, user_client, post):
+        data = user_client.get(
+            f'/api/v1/posts/?ids={post.id}&fields=id,text'
+        ).json()
+        assert data['results'] == [{'id': post.id, 'text': post.text}]
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('ids', (
+        '1,a', '', ',', '-', '0', '1,-5', str(2 ** 63), '1,' + '9' * 30
+    ))
+    def test_invalid_ids(self, user_client, ids):
+        response = user_client.get(f'/api/v1/posts/?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.django_db(transaction=True)
+    def test_limit(self, user_client, settings):
+        settings.API_BATCH_IDS_LIMIT = 2
+        response = user_client.get('/api/v1/posts/?ids=1,2,3')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что число id в запросе ограничено.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_anonymous(self, client, post):
+        response = client.get(f'/api/v1/posts/?ids={post.id}')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
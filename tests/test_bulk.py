@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from posts.models import Comment, Post
+
+
+class TestBulkCreate:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_posts(self, user_client, user, group_1):
+        data = [
+            {'text': 'Пост 1'},
+            {'text': 'Пост 2', 'group': group_1.id},
+        ]
+        response = user_client.post(
+            '/api/v1/posts/bulk/', data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос со списком постов к '
+            '`/api/v1/posts/bulk/` возвращает ответ со статусом 201.'
+        )
+        assert response.json() == {'created': 2}
+        assert Post.objects.filter(author=user).count() == 2
+        assert Post.objects.filter(group=group_1).count() == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_posts_reports_errors_per_item(self, user_client):
+        data = [{'text': 'Пост 1'}, {}, {'text': 'Пост 3'}]
+        response = user_client.post(
+            '/api/v1/posts/bulk/', data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and not errors[0] and 'text' in errors[1], (
+            'Проверьте, что ответ содержит ошибки для каждого элемента '
+            'списка в порядке запроса.'
+        )
+        assert not Post.objects.exists(), (
+            'Проверьте, что при ошибке в любом элементе ничего не создаётся.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(API_BULK_CREATE_LIMIT=2)
+    def test_bulk_limit(self, user_client):
+        response = user_client.post(
+            '/api/v1/posts/bulk/',
+            data=[{'text': str(i)} for i in range(3)],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not Post.objects.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_requires_list(self, user_client):
+        response = user_client.post(
+            '/api/v1/posts/bulk/', data={'text': 'Пост'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_unauth(self, client):
+        response = client.post(
+            '/api/v1/posts/bulk/',
+            data=[{'text': 'Пост'}],
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_comments(self, user_client, user, post):
+        response = user_client.post(
+            f'/api/v1/posts/{post.id}/comments/bulk/',
+            data=[{'text': 'Коммент 1'}, {'text': 'Коммент 2'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Comment.objects.filter(post=post, author=user).count() == 2
+
+        post.refresh_from_db()
+        assert post.comment_count == 2, (
+            'Проверьте, что пакетное создание комментариев обновляет '
+            '`comment_count` поста.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_comments_missing_post(self, user_client, post):
+        response = user_client.post(
+            f'/api/v1/posts/{post.id + 100}/comments/bulk/',
+            data=[{'text': 'Коммент'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from posts.models import Comment, Post
+
+
+class TestCommentStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_create_and_delete_update_counters(self, user_client, post):
+        url = f'/api/v1/posts/{post.id}/comments/'
+        first = user_client.post(url, data={'text': 'Первый'}).json()
+        second = user_client.post(url, data={'text': 'Второй'}).json()
+
+        post.refresh_from_db()
+        assert post.comment_count == 2, (
+            'Проверьте, что создание комментария увеличивает '
+            '`comment_count` поста.'
+        )
+        assert post.last_commented_at == Comment.objects.get(
+            id=second['id']
+        ).created
+
+        response = user_client.delete(f'{url}{second["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+        post.refresh_from_db()
+        assert post.comment_count == 1, (
+            'Проверьте, что удаление комментария уменьшает '
+            '`comment_count` поста.'
+        )
+        assert post.last_commented_at == Comment.objects.get(
+            id=first['id']
+        ).created
+
+    @pytest.mark.django_db(transaction=True)
+    def test_orm_changes_update_counters(self, user, post):
+        comment = Comment.objects.create(author=user, post=post, text='Текст')
+        post.refresh_from_db()
+        assert post.comment_count == 1, (
+            'Проверьте, что счётчики поста обновляются сигналами, а не '
+            'только во вьюсете комментариев.'
+        )
+        assert post.last_commented_at == comment.created
+
+        Post.objects.filter(pk=post.pk).update(comment_count=0)
+        comment.delete()
+        post.refresh_from_db()
+        assert post.comment_count == 0
+        assert post.last_commented_at is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_counters_in_same_transaction(self, user_client, post, group_1,
+                                          monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError
+
+        post.group = group_1
+        post.save()
+        monkeypatch.setattr('posts.signals.change_group_stats', fail)
+        with pytest.raises(RuntimeError):
+            user_client.post(
+                f'/api/v1/posts/{post.id}/comments/', data={'text': 'Текст'}
+            )
+        assert not Comment.objects.filter(post=post).exists(), (
+            'Проверьте, что комментарий создаётся в одной транзакции '
+            'с обновлением счётчиков.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_counters_are_read_only(self, user_client, post):
+        response = user_client.get(f'/api/v1/posts/{post.id}/')
+        assert response.json()['comment_count'] == 0
+
+        user_client.patch(
+            f'/api/v1/posts/{post.id}/',
+            data={'comment_count': 100}, format='json'
+        )
+        post.refresh_from_db()
+        assert post.comment_count == 0, (
+            'Проверьте, что поле `comment_count` доступно только для чтения.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_rebuild_command(self, post, another_post, comment_1_post,
+                             comment_2_post, comment_1_another_post):
+        call_command('rebuild_comment_stats', batch_size=1)
+
+        post.refresh_from_db()
+        another_post.refresh_from_db()
+        assert post.comment_count == 2
+        assert post.last_commented_at == comment_2_post.created
+        assert another_post.comment_count == 1
+        assert Post.objects.filter(comment_count=0).count() == 0
@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date, parse_http_date
+
+from api.cache import get_versions, post_scope
+
+
+class TestConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url', (
+        '/api/v1/posts/',
+        '/api/v1/posts/{post_id}/',
+        '/api/v1/posts/{post_id}/comments/',
+        '/api/v1/posts/{post_id}/comments/{comment_id}/',
+        '/api/v1/groups/',
+        '/api/v1/groups/{group_id}/',
+    ))
+    def test_not_modified_without_db(self, user_client, post, group_1,
+                                     comment_1_post, url):
+        url = url.format(
+            post_id=post.id, comment_id=comment_1_post.id,
+            group_id=group_1.id
+        )
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+        assert response.has_header('Last-Modified')
+
+        with CaptureQueriesContext(connection) as context:
+            repeated = user_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            'If-None-Match возвращает ответ со статусом 304.'
+        )
+        assert not repeated.content
+        assert not context.captured_queries, (
+            'Проверьте, что ответ 304 отдаётся без запросов к БД.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_if_modified_since(self, user_client, post):
+        url = f'/api/v1/posts/{post.id}/'
+        response = user_client.get(url)
+        # Момент, заведомо не раньше последнего изменения поста.
+        since = http_date(parse_http_date(response['Last-Modified']) + 1)
+
+        repeated = user_client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED
+
+    @pytest.mark.django_db(transaction=True)
+    def test_if_modified_since_same_second_change(self, user_client, post):
+        url = f'/api/v1/posts/{post.id}/'
+        last_modified = user_client.get(url)['Last-Modified']
+
+        user_client.patch(url, data={'text': 'Новый текст'})
+
+        response = user_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение в ту же секунду, что и Last-Modified, '
+            'не даёт ответа 304 на If-Modified-Since.'
+        )
+        assert response.json()['text'] == 'Новый текст'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_post_change_invalidates(self, user_client, post):
+        url = f'/api/v1/posts/{post.id}/'
+        etag = user_client.get(url)['ETag']
+        list_etag = user_client.get('/api/v1/posts/')['ETag']
+
+        user_client.patch(url, data={'text': 'Новый текст'})
+
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение поста меняет его ETag.'
+        )
+        assert response.json()['text'] == 'Новый текст'
+        assert user_client.get(
+            '/api/v1/posts/', HTTP_IF_NONE_MATCH=list_etag
+        ).status_code == HTTPStatus.OK
+
+    @pytest.mark.django_db(transaction=True)
+    def test_versions_change_after_commit(self, post):
+        scopes = ('posts', post_scope(post.id))
+        before = get_versions(scopes)
+        with transaction.atomic():
+            post.text = 'Новый текст'
+            post.save()
+            assert get_versions(scopes) == before, (
+                'Проверьте, что метки изменений обновляются только после '
+                'фиксации транзакции.'
+            )
+        after = get_versions(scopes)
+        assert all(new > old for new, old in zip(after, before))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_new_comment_invalidates(self, user_client, post):
+        comments_url = f'/api/v1/posts/{post.id}/comments/'
+        post_url = f'/api/v1/posts/{post.id}/'
+        comments_etag = user_client.get(comments_url)['ETag']
+        post_etag = user_client.get(post_url)['ETag']
+
+        user_client.post(comments_url, data={'text': 'Коммент'})
+
+        response = user_client.get(
+            comments_url, HTTP_IF_NONE_MATCH=comments_etag
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()) == 1
+        assert user_client.get(
+            post_url, HTTP_IF_NONE_MATCH=post_etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag поста, так как '
+            'меняется `comment_count`.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_query_string_changes_etag(self, user_client, post):
+        full = user_client.get('/api/v1/posts/')['ETag']
+        page = user_client.get('/api/v1/posts/?limit=1')['ETag']
+        assert full != page
+
+    @pytest.mark.django_db(transaction=True)
+    def test_missing_post_has_no_etag(self, user_client, post):
+        response = user_client.get(f'/api/v1/posts/{post.id + 100}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not response.has_header('ETag')
@@ -0,0 +1,104 @@
+import importlib
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from posts.database import check_persistent_connections, configure_sqlite
+
+
+class TestDatabaseSettings:
+
+    @pytest.mark.django_db
+    def test_sqlite_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+        assert synchronous == 1, (
+            'Проверьте, что для SQLite включается synchronous=normal.'
+        )
+        assert busy_timeout == 20000, (
+            'Проверьте, что для SQLite задаётся время ожидания блокировки.'
+        )
+
+    @pytest.mark.parametrize('journal_mode', (None, 'wal'))
+    def test_journal_mode_on_file_database(self, tmp_path, settings,
+                                           journal_mode):
+        import sqlite3
+
+        class FileConnection:
+            vendor = 'sqlite'
+
+            def __init__(self, path):
+                self.raw = sqlite3.connect(path)
+
+            def cursor(self):
+                return self.raw
+
+        pragmas = dict(settings.SQLITE_PRAGMAS)
+        pragmas.pop('journal_mode', None)
+        if journal_mode:
+            pragmas['journal_mode'] = journal_mode
+        settings.SQLITE_PRAGMAS = pragmas
+        file_connection = FileConnection(tmp_path / 'db.sqlite3')
+        configure_sqlite(sender=None, connection=file_connection)
+        mode = file_connection.raw.execute('PRAGMA journal_mode').fetchone()
+        assert mode[0] == (journal_mode or 'delete'), (
+            'Проверьте, что WAL включается только через SQLITE_JOURNAL_MODE '
+            'и по умолчанию режим журнала файла базы не меняется.'
+        )
+
+    @pytest.mark.django_db
+    def test_unusable_connection_closed(self, monkeypatch):
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', 60)
+        monkeypatch.setitem(
+            connection.settings_dict, 'CONN_HEALTH_CHECKS', True
+        )
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+        closed = []
+
+        check_persistent_connections()
+        assert not closed, 'Рабочее соединение не должно закрываться.'
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        check_persistent_connections()
+        assert closed, (
+            'Проверьте, что оборванное постоянное соединение закрывается '
+            'в начале запроса.'
+        )
+
+    def test_postgresql_profile(self, monkeypatch):
+        from yatube_api import settings as project_settings
+
+        monkeypatch.setenv('DB_ENGINE', 'postgresql')
+        monkeypatch.setenv('DB_CONN_MAX_AGE', '120')
+        try:
+            database = importlib.reload(project_settings).DATABASES['default']
+        finally:
+            monkeypatch.delenv('DB_ENGINE')
+            importlib.reload(project_settings)
+        assert database['ENGINE'] == 'django.db.backends.postgresql'
+        assert database['CONN_MAX_AGE'] == 120
+        assert database['CONN_HEALTH_CHECKS']
+
+    def test_replicas_require_shared_cache(self, monkeypatch):
+        from yatube_api import settings as project_settings
+
+        monkeypatch.setenv('DB_REPLICAS', 'replica.sqlite3')
+        try:
+            with pytest.raises(ImproperlyConfigured):
+                importlib.reload(project_settings)
+            monkeypatch.setenv(
+                'CACHE_BACKEND',
+                'django.core.cache.backends.memcached.PyMemcacheCache'
+            )
+            replicas = importlib.reload(project_settings).DATABASE_REPLICAS
+        finally:
+            monkeypatch.delenv('DB_REPLICAS')
+            monkeypatch.delenv('CACHE_BACKEND')
+            importlib.reload(project_settings)
+        assert replicas == ['replica_1'], (
+            'Проверьте, что реплики настраиваются вместе с общим кэшем.'
+        )
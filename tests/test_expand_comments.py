@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from posts.models import Comment, Post
+
+
+def comment_queries(client, url):
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), [
+        sql for sql in queries if 'FROM "posts_comment"' in sql
+    ]
+
+
+class TestExpandComments:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_latest_comments_in_one_query(self, user_client, user):
+        posts = [
+            Post.objects.create(text=f'Пост {i}', author=user)
+            for i in range(5)
+        ]
+        for post in posts:
+            for number in range(4):
+                Comment.objects.create(
+                    author=user, post=post, text=f'{post.text}: {number}'
+                )
+
+        data, queries = comment_queries(
+            user_client, '/api/v1/posts/?expand=comments&comments_limit=2'
+        )
+        assert len(queries) == 1, (
+            'Проверьте, что комментарии всех постов загружаются одним '
+            'запросом.'
+        )
+        for item in data:
+            assert [comment['text'] for comment in item['comments']] == [
+                f'{item["text"]}: 3', f'{item["text"]}: 2'
+            ], 'Проверьте, что возвращаются последние N комментариев.'
+
+        page, _ = comment_queries(
+            user_client, '/api/v1/posts/?limit=2&expand=comments'
+        )
+        assert len(page['results']) == 2
+        assert len(page['results'][0]['comments']) == 3, (
+            'Проверьте значение comments_limit по умолчанию.'
+        )
+
+        detail, _ = comment_queries(
+            user_client,
+            f'/api/v1/posts/{posts[0].id}/?expand=comments&comments_limit=1'
+        )
+        assert [comment['text'] for comment in detail['comments']] == [
+            'Пост 0: 3'
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_without_expand(self, user_client, post, comment_1_post):
+        data, queries = comment_queries(user_client, '/api/v1/posts/')
+        assert 'comments' not in data[0]
+        assert not queries
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('query', (
+        'expand=author', 'expand=comments&comments_limit=0',
+        'expand=comments&comments_limit=100',
+        'expand=comments&comments_limit=x',
+    ))
+    def test_invalid_params(self, user_client, post, query):
+        response = user_client.get(f'/api/v1/posts/?{query}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.django_db(transaction=True)
+    def test_sparse_fields(self, user_client, post, comment_1_post):
+        data, queries = comment_queries(
+            user_client, '/api/v1/posts/?expand=comments&fields=id,text'
+        )
+        assert data == [{'id': post.id, 'text': post.text}], (
+            'Проверьте, что `fields` без `comments` убирает комментарии '
+            'из ответа.'
+        )
+        assert not queries
+
+        data, _ = comment_queries(
+            user_client, '/api/v1/posts/?expand=comments&fields=id,comments'
+        )
+        assert set(data[0]) == {'id', 'comments'}, (
+            'Проверьте, что `comments` можно указать в `fields`.'
+        )
+        assert [comment['id'] for comment in data[0]['comments']] == [
+            comment_1_post.id
+        ]
+
+        response = user_client.get('/api/v1/posts/?fields=id,comments')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что `comments` в `fields` требует `expand=comments`.'
+        )
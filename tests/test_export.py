@@ -0,0 +1,53 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+def parse_ndjson(content):
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class TestExportPosts:
+    URL = '/api/v1/export/posts/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_unauth(self, client, post):
+        response = client.get(self.URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_streams_posts_with_comments(self, user_client, post,
+                                                another_post, comment_1_post,
+                                                comment_2_post,
+                                                comment_1_another_post):
+        response = user_client.get(self.URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+
+        rows = parse_ndjson(
+            b''.join(response.streaming_content).decode('utf-8')
+        )
+        assert [row['id'] for row in rows] == [post.id, another_post.id]
+        assert [comment['id'] for comment in rows[0]['comments']] == [
+            comment_1_post.id, comment_2_post.id
+        ]
+        assert rows[0]['author'] == post.author.username
+        assert [comment['id'] for comment in rows[1]['comments']] == [
+            comment_1_another_post.id
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_command(self, post, another_post, comment_1_post):
+        out = StringIO()
+        call_command('export_posts', chunk_size=1, stdout=out)
+
+        rows = parse_ndjson(out.getvalue())
+        assert [row['id'] for row in rows] == [post.id, another_post.id]
+        assert len(rows[0]['comments']) == 1
+        assert rows[1]['comments'] == []
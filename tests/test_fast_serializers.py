@@ -0,0 +1,67 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.fast_serializers import ValuesSerializer
+from api.serializers import (
+    CommentSerializer, GroupSerializer, PostSerializer
+)
+from posts.models import Comment, Group, Post
+
+
+def render_both(serializer_class, queryset, context):
+    regular = serializer_class(queryset, many=True, context=context).data
+    fast = ValuesSerializer.for_serializer(serializer_class(context=context))
+    assert fast is not None
+    rows = fast.values(queryset)
+    return (
+        JSONRenderer().render(regular),
+        JSONRenderer().render(fast.to_representation(rows)),
+    )
+
+
+@pytest.fixture
+def context():
+    return {'request': Request(APIRequestFactory().get('/api/v1/posts/'))}
+
+
+@pytest.mark.django_db
+class TestValuesSerializer:
+
+    def test_posts_identical(self, context, post, post_2, another_post,
+                             comment_1_post):
+        Post.objects.filter(id=post.id).refresh_comment_stats()
+        regular, fast = render_both(
+            PostSerializer, Post.objects.order_by('id'), context
+        )
+        assert fast == regular, (
+            'Проверьте, что быстрый путь сериализации постов даёт тот же '
+            'JSON, что и PostSerializer.'
+        )
+
+    def test_posts_identical_without_request(self, post, post_2):
+        regular, fast = render_both(
+            PostSerializer, Post.objects.order_by('id'), {}
+        )
+        assert fast == regular
+
+    def test_sparse_fields_identical(self, context, post, post_2):
+        context['fields'] = ['id', 'author', 'image']
+        regular, fast = render_both(
+            PostSerializer, Post.objects.order_by('id'), context
+        )
+        assert fast == regular
+
+    def test_comments_identical(self, context, comment_1_post,
+                                comment_2_post, comment_1_another_post):
+        regular, fast = render_both(
+            CommentSerializer, Comment.objects.order_by('id'), context
+        )
+        assert fast == regular
+
+    def test_groups_identical(self, context, group_1, group_2):
+        regular, fast = render_both(
+            GroupSerializer, Group.objects.order_by('id'), context
+        )
+        assert fast == regular
@@ -0,0 +1,126 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from posts.feeds import feed_key
+from posts.models import Follow, Post
+
+
+@pytest.fixture
+def author_client(another_user):
+    client = APIClient()
+    token = Token.objects.create(user=another_user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+@pytest.fixture
+def follow(user, another_user):
+    return Follow.objects.create(user=user, following=another_user)
+
+
+def feed_texts(client, url='/api/v1/feed/'):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [post['text'] for post in response.json()['results']]
+
+
+def publish(client, text):
+    response = client.post('/api/v1/posts/', data={'text': text})
+    assert response.status_code == HTTPStatus.CREATED
+    return response.json()['id']
+
+
+class TestFollow:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_follow(self, user_client, user, another_user):
+        response = user_client.post(
+            '/api/v1/follow/', data={'following': another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['user'] == user.username
+        assert user_client.post(
+            '/api/v1/follow/', data={'following': another_user.username}
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторная подписка запрещена.'
+        )
+        assert user_client.post(
+            '/api/v1/follow/', data={'following': user.username}
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что подписка на себя запрещена.'
+        )
+        assert len(user_client.get('/api/v1/follow/').json()) == 1
+
+
+class TestFeed:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_fan_out_on_write(self, user_client, author_client, user,
+                              follow, post):
+        assert feed_texts(user_client) == [], (
+            'Проверьте, что в ленту попадают только посты из подписок.'
+        )
+        first = publish(author_client, 'Первый')
+        second = publish(author_client, 'Второй')
+        assert cache.get(feed_key(user.id)) == [second, first], (
+            'Проверьте, что новый пост дописывается в ленты подписчиков '
+            'при публикации.'
+        )
+        assert feed_texts(user_client) == ['Второй', 'Первый']
+
+        cache.clear()
+        assert feed_texts(user_client) == ['Второй', 'Первый'], (
+            'Проверьте, что лента собирается из БД, если её нет в кэше.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_pages(self, user_client, author_client, follow):
+        for number in range(3):
+            publish(author_client, f'Пост {number}')
+        response = user_client.get('/api/v1/feed/?limit=2').json()
+        assert [post['text'] for post in response['results']] == [
+            'Пост 2', 'Пост 1'
+        ]
+        assert feed_texts(user_client, response['next']) == ['Пост 0']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_big_author_is_pulled(self, user_client, author_client, user,
+                                  follow, settings):
+        settings.FEED_FANOUT_LIMIT = 0
+        feed_texts(user_client)
+        post_id = publish(author_client, 'Для всех')
+        assert not Post.objects.get(id=post_id).fanned_out
+        assert cache.get(feed_key(user.id)) == [], (
+            'Проверьте, что посты авторов с большим числом подписчиков '
+            'не рассылаются по лентам.'
+        )
+        assert feed_texts(user_client) == ['Для всех'], (
+            'Проверьте, что такие посты добираются в ленту при чтении.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_and_unfollow(self, user_client, author_client, follow):
+        feed_texts(user_client)
+        response = author_client.post(
+            '/api/v1/posts/bulk/',
+            data=json.dumps([{'text': 'Один'}, {'text': 'Два'}]),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert feed_texts(user_client) == ['Два', 'Один']
+
+        user_client.delete(f'/api/v1/follow/{follow.id}/')
+        assert feed_texts(user_client) == [], (
+            'Проверьте, что после отписки лента пересобирается.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_anonymous(self, client):
+        assert client.get('/api/v1/feed/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
@@ -0,0 +1,74 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import VERSION_KEY
+from posts.models import Group
+
+
+def group_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'posts_group' in query['sql']
+    ]
+
+
+class TestGroupCache:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url', ('/api/v1/groups/', '/api/v1/groups/{id}/'))
+    def test_repeated_get_served_from_cache(self, user_client, group_1, url):
+        url = url.format(id=group_1.id)
+        first = user_client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            second = user_client.get(url)
+
+        assert second.json() == first.json()
+        assert not group_queries(context), (
+            f'Проверьте, что повторный GET-запрос к `{url}` не обращается '
+            'к таблице групп.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cache_invalidated_on_save(self, user_client, group_1):
+        user_client.get('/api/v1/groups/')
+        user_client.get(f'/api/v1/groups/{group_1.id}/')
+
+        group_1.title = 'Новое название'
+        group_1.save()
+
+        assert user_client.get('/api/v1/groups/').json()[0]['title'] == (
+            'Новое название'
+        ), 'Проверьте, что изменение группы сбрасывает кэш списка групп.'
+        assert user_client.get(
+            f'/api/v1/groups/{group_1.id}/'
+        ).json()['title'] == 'Новое название', (
+            'Проверьте, что изменение группы сбрасывает кэш группы.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_list_key_survives_version_expiry(self, user_client, group_1):
+        user_client.get('/api/v1/groups/')
+        # Метки ETag истекают через API_VERSION_TIMEOUT, ключ списка — нет.
+        cache.delete_many([
+            VERSION_KEY.format(scope=scope) for scope in ('authors', 'groups')
+        ])
+
+        with CaptureQueriesContext(connection) as context:
+            user_client.get('/api/v1/groups/')
+        assert not group_queries(context), (
+            'Проверьте, что ключ кэша списка групп не зависит от меток '
+            'изменений с коротким сроком жизни.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cache_invalidated_on_delete(self, user_client, group_1, group_2):
+        user_client.get('/api/v1/groups/')
+
+        group_2.delete()
+
+        assert len(user_client.get('/api/v1/groups/').json()) == (
+            Group.objects.count()
+        ), 'Проверьте, что удаление группы сбрасывает кэш списка групп.'
@@ -0,0 +1,214 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.filters import TieBreakOrderingFilter
+from api.views import GroupViewSet
+from posts.models import Comment, Group, Post
+from posts.signals import group_stats_changed
+
+
+def stats(group):
+    group.refresh_from_db()
+    return group.post_count, group.comment_count
+
+
+def count_queries(action):
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        action()
+    return len(queries)
+
+
+class TestGroupStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_incremental_updates(self, user_client, user, group_1, group_2):
+        response = user_client.post(
+            '/api/v1/posts/', data={'text': 'Пост', 'group': group_1.id}
+        )
+        post_id = response.json()['id']
+        user_client.post(
+            f'/api/v1/posts/{post_id}/comments/', data={'text': 'Первый'}
+        )
+        response = user_client.post(
+            f'/api/v1/posts/{post_id}/comments/', data={'text': 'Второй'}
+        )
+        assert stats(group_1) == (1, 2), (
+            'Проверьте, что счётчики группы растут при создании постов '
+            'и комментариев.'
+        )
+        assert group_1.last_activity == Comment.objects.get(
+            id=response.json()['id']
+        ).created, 'Проверьте, что last_activity — время последней записи.'
+
+        user_client.delete(
+            f'/api/v1/posts/{post_id}/comments/{response.json()["id"]}/'
+        )
+        assert stats(group_1) == (1, 1)
+
+        user_client.patch(
+            f'/api/v1/posts/{post_id}/', data={'group': group_2.id}
+        )
+        assert stats(group_1) == (0, 0), (
+            'Проверьте, что перенос поста в другую группу обновляет '
+            'счётчики обеих групп.'
+        )
+        assert stats(group_2) == (1, 1)
+
+        user_client.delete(f'/api/v1/posts/{post_id}/')
+        assert stats(group_2) == (0, 0), (
+            'Проверьте, что удаление поста вычитает его и его комментарии.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_changed_signal_after_commit(self, user, group_1):
+        sent = []
+
+        def receiver(sender, group_ids, **kwargs):
+            sent.append(group_ids)
+
+        group_stats_changed.connect(receiver)
+        try:
+            with transaction.atomic():
+                Post.objects.create(text='Пост', author=user, group=group_1)
+                assert not sent, (
+                    'Проверьте, что group_stats_changed отправляется только '
+                    'после фиксации транзакции.'
+                )
+        finally:
+            group_stats_changed.disconnect(receiver)
+        assert sent == [[group_1.id]]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bulk_create(self, user_client, group_1):
+        user_client.post(
+            '/api/v1/posts/bulk/',
+            data=json.dumps([{'text': 'Один', 'group': group_1.id}] * 3),
+            content_type='application/json'
+        )
+        post = Post.objects.first()
+        user_client.post(
+            f'/api/v1/posts/{post.id}/comments/bulk/',
+            data=json.dumps([{'text': 'Комментарий'}] * 2),
+            content_type='application/json'
+        )
+        assert stats(group_1) == (3, 2), (
+            'Проверьте, что пакетное создание обновляет счётчики групп.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_counters_not_below_zero(self, user, group_1, group_2):
+        post = Post.objects.create(text='Пост', author=user, group=group_1)
+        Comment.objects.create(author=user, post=post, text='Комментарий')
+        # update() не отправляет сигналов: счётчики групп расходятся с БД.
+        Post.objects.filter(pk=post.pk).update(group=group_2)
+
+        Post.objects.get(pk=post.pk).delete()
+        assert stats(group_2) == (0, 0), (
+            'Проверьте, что счётчики групп не опускаются ниже нуля и '
+            'удаление не падает при их расхождении с БД.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cascade_delete(self, user, another_user, group_1, group_2):
+        def make_post(author, group, comments):
+            post = Post.objects.create(text='Пост', author=author, group=group)
+            for number in range(comments):
+                Comment.objects.create(
+                    author=user, post=post, text=f'Комментарий {number}'
+                )
+            return post
+
+        small = make_post(another_user, group_1, 1)
+        large = make_post(another_user, group_1, 10)
+        assert count_queries(small.delete) == count_queries(large.delete), (
+            'Проверьте, что число запросов при удалении поста не зависит '
+            'от числа его комментариев.'
+        )
+        assert stats(group_1) == (0, 0)
+
+        own = make_post(user, group_1, 3)
+        foreign = make_post(another_user, group_2, 2)
+        Comment.objects.create(author=another_user, post=foreign, text='Ещё')
+        user.delete()
+        assert not Post.objects.filter(pk=own.pk).exists()
+        foreign.refresh_from_db()
+        assert foreign.comment_count == 1, (
+            'Проверьте, что удаление автора обновляет счётчики постов, '
+            'которые он комментировал.'
+        )
+        assert stats(group_1) == (0, 0)
+        assert stats(group_2) == (1, 1)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_reconcile_command(self, post_2, comment_1_post, group_1,
+                               capsys):
+        Comment.objects.create(
+            author=post_2.author, post=post_2, text='Комментарий'
+        )
+        Group.objects.update(post_count=10, comment_count=10)
+        call_command('reconcile_group_stats')
+        assert stats(group_1) == (1, 1), (
+            'Проверьте, что команда reconcile_group_stats пересчитывает '
+            'счётчики групп.'
+        )
+        assert 'Обновлено групп: 1' in capsys.readouterr().out
+
+
+class TestGroupOrdering:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_ordering(self, user_client, user, group_1, group_2):
+        Post.objects.create(text='Пост', author=user, group=group_2)
+        plain = user_client.get('/api/v1/groups/').json()
+        ordered = user_client.get('/api/v1/groups/?ordering=-post_count')
+        assert [group['slug'] for group in ordered.json()] == [
+            'group_2', 'group_1'
+        ], 'Проверьте сортировку групп параметром `ordering`.'
+        assert ordered.json()[0]['post_count'] == 1
+        assert [group['slug'] for group in plain] == ['group_1', 'group_2'], (
+            'Проверьте, что варианты списка групп кэшируются отдельно.'
+        )
+
+        Post.objects.create(text='Пост', author=user, group=group_1)
+        Post.objects.create(text='Пост', author=user, group=group_1)
+        ordered = user_client.get('/api/v1/groups/?ordering=-post_count')
+        assert ordered.json()[0]['slug'] == 'group_2', (
+            'Проверьте, что записи в группах не сбрасывают кэш списков групп.'
+        )
+        assert user_client.get(
+            f'/api/v1/groups/{group_1.id}/'
+        ).json()['post_count'] == 2, (
+            'Проверьте, что изменение счётчиков сбрасывает кэш группы.'
+        )
+
+        group_1.refresh_from_db()
+        group_1.title = 'Новое название'
+        group_1.save()
+        ordered = user_client.get('/api/v1/groups/?ordering=-post_count')
+        assert ordered.json()[0]['slug'] == 'group_1', (
+            'Проверьте, что изменение группы сбрасывает кэш списков групп.'
+        )
+
+    @pytest.mark.django_db
+    def test_ordering_uses_index(self):
+        request = Request(
+            APIRequestFactory().get('/', {'ordering': '-post_count'})
+        )
+        queryset = TieBreakOrderingFilter().filter_queryset(
+            request, Group.objects.all(), GroupViewSet()
+        )
+        plan = queryset.explain()
+        assert 'group_post_count_idx' in plan and 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что сортировка по post_count идёт по индексу:\n{plan}'
+        )
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from posts.images import generate_variants
+from posts.models import Post
+
+scheduled = []
+
+
+def record_task(func, *args):
+    scheduled.append((func, args))
+
+
+def make_image(size=(1600, 1200), name='picture.png'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color=(200, 30, 30)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_RUNNER = 'posts.images.run_inline'
+    return tmp_path
+
+
+class TestImageVariants:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_variants_generated(self, user_client, media):
+        response = user_client.post(
+            '/api/v1/posts/', data={'text': 'Пост', 'image': make_image()}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        post = Post.objects.get(id=response.json()['id'])
+        assert set(post.image_variants) == {'thumbnail', 'medium'}
+        for variant, limit in (('thumbnail', 200), ('medium', 800)):
+            with Image.open(media / post.image_variants[variant]) as image:
+                assert max(image.size) == limit, (
+                    f'Проверьте размер копии `{variant}`.'
+                )
+
+        data = user_client.get(f'/api/v1/posts/{post.id}/').json()
+        assert data['image_variants']['thumbnail'].startswith(
+            'http://testserver/media/posts/variants/'
+        ), 'Проверьте, что URL копий изображения есть в ответе API.'
+        listed = user_client.get('/api/v1/posts/').json()
+        assert listed[0]['image_variants'] == data['image_variants']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_processing_is_deferred(self, user_client, media, settings):
+        settings.POST_IMAGE_RUNNER = 'tests.test_images.record_task'
+        scheduled.clear()
+
+        response = user_client.post(
+            '/api/v1/posts/', data={'text': 'Пост', 'image': make_image()}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['image_variants'] == {}, (
+            'Проверьте, что запрос на создание поста не ждёт построения '
+            'копий изображения.'
+        )
+        assert scheduled == [(generate_variants, (response.json()['id'],))]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_image_replaced(self, user_client, media):
+        response = user_client.post(
+            '/api/v1/posts/', data={'text': 'Пост', 'image': make_image()}
+        )
+        post_id = response.json()['id']
+
+        user_client.patch(
+            f'/api/v1/posts/{post_id}/',
+            data={'image': make_image((300, 100), 'other.png')}
+        )
+        post = Post.objects.get(id=post_id)
+        with Image.open(media / post.image_variants['medium']) as image:
+            assert image.size == (300, 100)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_post_without_image(self, user_client, media):
+        response = user_client.post('/api/v1/posts/', data={'text': 'Пост'})
+        assert response.json()['image_variants'] == {}
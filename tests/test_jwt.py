@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+
+@pytest.fixture
+def jwt_tokens(client, user, password):
+    response = client.post(
+        '/api/v1/jwt/create/',
+        data={'username': user.username, 'password': password}
+    )
+    assert response.status_code == HTTPStatus.OK, (
+        'Проверьте, что POST-запрос к `/api/v1/jwt/create/` с корректными '
+        'данными возвращает ответ со статусом 200.'
+    )
+    return response.json()
+
+
+@pytest.fixture
+def jwt_client(jwt_tokens):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {jwt_tokens["access"]}')
+    return client
+
+
+class TestJWT:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_create_returns_pair(self, jwt_tokens):
+        assert {'access', 'refresh'} <= set(jwt_tokens)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_refresh(self, client, jwt_tokens):
+        response = client.post(
+            '/api/v1/jwt/refresh/', data={'refresh': jwt_tokens['refresh']}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert 'access' in response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_read_without_user_lookup(self, jwt_client, group_1):
+        with CaptureQueriesContext(connection) as context:
+            response = jwt_client.get('/api/v1/groups/')
+
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query for query in context.captured_queries
+            if 'auth_user' in query['sql'] or 'authtoken' in query['sql']
+        ], (
+            'Проверьте, что аутентификация по JWT не обращается к таблицам '
+            'пользователей и токенов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_write_with_jwt(self, jwt_client, user, another_post):
+        response = jwt_client.post('/api/v1/posts/', data={'text': 'Пост'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+
+        post_id = response.json()['id']
+        response = jwt_client.patch(
+            f'/api/v1/posts/{post_id}/', data={'text': 'Новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert Post.objects.get(id=post_id).text == 'Новый текст'
+
+        response = jwt_client.delete(f'/api/v1/posts/{another_post.id}/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пользователь с JWT не может удалить чужой пост.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalid_token(self, post):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer invalid')
+        response = client.get('/api/v1/posts/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment, Post
+
+
+class TestCursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_without_params_not_paginated(self, user_client, post,
+                                                another_post):
+        response = user_client.get('/api/v1/posts/')
+        assert response.status_code == HTTPStatus.OK
+        assert isinstance(response.json(), list), (
+            'Проверьте, что без параметров `cursor` и `limit` список постов '
+            'возвращается целиком.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_cursor_walk(self, user_client, user):
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=user) for i in range(5)
+        )
+        expected = list(
+            Post.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+
+        received = []
+        url = '/api/v1/posts/?limit=2'
+        while url:
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert len(data['results']) <= 2, (
+                'Проверьте, что параметр `limit` ограничивает размер страницы.'
+            )
+            received.extend(item['id'] for item in data['results'])
+            url = data['next']
+
+        assert received == expected, (
+            'Проверьте, что обход `/api/v1/posts/` по курсору возвращает все '
+            'посты ровно один раз в порядке `(-pub_date, -id)`.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_comments_cursor_walk(self, user_client, user, post):
+        Comment.objects.bulk_create(
+            Comment(text=f'Коммент {i}', author=user, post=post)
+            for i in range(5)
+        )
+        expected = list(
+            post.comments.order_by('created', 'id').values_list(
+                'id', flat=True
+            )
+        )
+
+        received = []
+        url = f'/api/v1/posts/{post.id}/comments/?limit=2'
+        while url:
+            data = user_client.get(url).json()
+            received.extend(item['id'] for item in data['results'])
+            url = data['next']
+
+        assert received == expected, (
+            'Проверьте, что обход комментариев по курсору возвращает все '
+            'комментарии ровно один раз в порядке `(created, id)`.'
+        )
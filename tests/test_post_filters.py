@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.filters import PostFilter
+from posts.models import Post
+
+
+def filtered(params):
+    request = Request(APIRequestFactory().get('/api/v1/posts/', params))
+    return PostFilter().filter_queryset(request, Post.objects.all(), None)
+
+
+class TestPostFilters:
+
+    def ids(self, client, params):
+        response = client.get('/api/v1/posts/', params)
+        assert response.status_code == 200
+        return {item['id'] for item in response.json()}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_filter_by_group(self, user_client, post, post_2, group_1):
+        assert self.ids(user_client, {'group': group_1.id}) == {post_2.id}
+        assert self.ids(user_client, {'group': group_1.slug}) == {
+            post_2.id
+        }, 'Проверьте, что `?group=` принимает slug группы.'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_filter_by_author(self, user_client, post, another_post,
+                              another_user):
+        assert self.ids(user_client, {'author': another_user.username}) == {
+            another_post.id
+        }, 'Проверьте, что `?author=` фильтрует посты по username автора.'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_filter_by_pub_date(self, user_client, post, another_post):
+        old = timezone.now() - timedelta(days=10)
+        Post.objects.filter(id=another_post.id).update(pub_date=old)
+        border = (old + timedelta(days=1)).date().isoformat()
+
+        assert self.ids(user_client, {'pub_date_after': border}) == {post.id}
+        assert self.ids(user_client, {'pub_date_before': border}) == {
+            another_post.id
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalid_date(self, user_client, post):
+        response = user_client.get(
+            '/api/v1/posts/', {'pub_date_after': 'вчера'}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что некорректная дата в фильтре возвращает ответ '
+            'со статусом 400.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalid_group(self, user_client, post):
+        assert self.ids(user_client, {'group': '²'}) == set(), (
+            'Проверьте, что `?group=` с не-ASCII цифрами ищет группу по slug.'
+        )
+        for group in ('0', str(2 ** 63), '9' * 30):
+            response = user_client.get('/api/v1/posts/', {'group': group})
+            assert response.status_code == 400, (
+                'Проверьте, что id группы вне диапазона возвращает ответ '
+                'со статусом 400.'
+            )
+
+
+@pytest.mark.django_db
+class TestPostFilterIndexes:
+
+    @pytest.mark.parametrize('params', (
+        {'group': '1'},
+        {'group': 'group_1'},
+        {'author': 'TestUser'},
+        {'pub_date_after': '2024-01-01'},
+        {'pub_date_before': '2024-01-01'},
+        {'group': '1', 'pub_date_after': '2024-01-01'},
+        {'author': 'TestUser', 'pub_date_before': '2024-01-01'},
+    ))
+    def test_filter_uses_index(self, params):
+        plan = filtered(params).explain()
+        post_steps = [
+            line for line in plan.splitlines() if 'posts_post' in line
+        ]
+        assert post_steps and all(
+            'SEARCH' in line and 'INDEX' in line for line in post_steps
+        ), (
+            f'Проверьте, что фильтр {params} использует индекс, а не полный '
+            f'просмотр таблицы постов:\n{plan}'
+        )
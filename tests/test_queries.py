@@ -0,0 +1,107 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import token_cache
+from posts.models import Comment, Group, Post
+
+
+def count_queries(client, url):
+    token_cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+class TestListQueryCount:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_list_queries_do_not_grow(self, user_client, user,
+                                            another_user, group_1):
+        Post.objects.create(text='Пост', author=user, group=group_1)
+        single = count_queries(user_client, '/api/v1/posts/')
+
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=author, group=group_1)
+            for i in range(10)
+            for author in (user, another_user)
+        )
+        many = count_queries(user_client, '/api/v1/posts/')
+
+        assert single == many, (
+            'Проверьте, что число запросов к БД при GET-запросе к '
+            '`/api/v1/posts/` не зависит от количества постов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_comments_list_queries_do_not_grow(self, user_client, user,
+                                               another_user, post):
+        url = f'/api/v1/posts/{post.id}/comments/'
+        Comment.objects.create(text='Коммент', author=user, post=post)
+        single = count_queries(user_client, url)
+
+        Comment.objects.bulk_create(
+            Comment(text=f'Коммент {i}', author=author, post=post)
+            for i in range(10)
+            for author in (user, another_user)
+        )
+        many = count_queries(user_client, url)
+
+        assert single == many, (
+            'Проверьте, что число запросов к БД при GET-запросе к '
+            '`/api/v1/posts/{post.id}/comments/` не зависит от количества '
+            'комментариев.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_groups_list_queries_do_not_grow(self, user_client, group_1):
+        single = count_queries(user_client, '/api/v1/groups/')
+
+        Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'group_n{i}') for i in range(10)
+        )
+        cache.clear()
+        many = count_queries(user_client, '/api/v1/groups/')
+
+        assert single == many, (
+            'Проверьте, что число запросов к БД при GET-запросе к '
+            '`/api/v1/groups/` не зависит от количества групп.'
+        )
+
+
+class TestCommentPostLookup:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('detail', (False, True))
+    def test_no_separate_post_query(self, user_client, post, comment_1_post,
+                                    detail):
+        url = f'/api/v1/posts/{post.id}/comments/'
+        if detail:
+            url += f'{comment_1_post.id}/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url)
+
+        assert response.status_code == 200
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "posts_post"' in query['sql']
+        ], (
+            f'Проверьте, что GET-запрос к `{url}` не загружает пост '
+            'отдельным запросом.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_missing_post_returns_404(self, user_client, post):
+        response = user_client.get(f'/api/v1/posts/{post.id + 100}/comments/')
+        assert response.status_code == 404, (
+            'Проверьте, что запрос комментариев несуществующего поста '
+            'возвращает ответ со статусом 404.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_empty_comments_of_existing_post(self, user_client, post):
+        response = user_client.get(f'/api/v1/posts/{post.id}/comments/')
+        assert response.status_code == 200
+        assert response.json() == []
@@ -0,0 +1,89 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import CompactJSONRenderer, FastJSONRenderer
+
+PAYLOAD = {
+    'id': 1,
+    'text': 'Текст «с символами»\u2028и\u2029, "кавычками" и \\',
+    'pub_date': timezone.now(),
+    'naive': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456),
+    'date': datetime.date(2024, 5, 1),
+    'price': decimal.Decimal('10.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'image': 'http://testserver/media/posts/%D0%BA%D0%BE%D1%82.jpg',
+    'group': None,
+    'flags': [True, False, 1.5],
+    'nested': [{'id': 2, 'created': timezone.now()}],
+}
+
+
+@pytest.fixture(params=('fast', 'fallback'))
+def backend(request, monkeypatch):
+    if request.param == 'fallback':
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+    elif renderers.orjson is None:
+        pytest.skip('orjson не установлен')
+    return request.param
+
+
+class TestFastJSON:
+
+    def test_render_identical(self, backend):
+        assert FastJSONRenderer().render(PAYLOAD) == (
+            JSONRenderer().render(PAYLOAD)
+        ), (
+            'Проверьте, что FastJSONRenderer выдаёт тот же JSON, что и '
+            'JSONRenderer.'
+        )
+
+    def test_render_indent(self, backend):
+        media_type = 'application/json; indent=2'
+        assert FastJSONRenderer().render(PAYLOAD, media_type) == (
+            JSONRenderer().render(PAYLOAD, media_type)
+        )
+
+    def test_render_none(self, backend):
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_compact_setting_respected(self, backend, monkeypatch):
+        assert CompactJSONRenderer.compact is JSONRenderer.compact, (
+            'Проверьте, что CompactJSONRenderer не переопределяет '
+            'атрибут `compact` (настройка COMPACT_JSON).'
+        )
+        monkeypatch.setattr(CompactJSONRenderer, 'compact', False)
+        assert CompactJSONRenderer().render([{'id': 1}]) == (
+            b'{"fields": ["id"], "rows": [[1]]}'
+        )
+
+    def test_parse(self, backend):
+        body = JSONRenderer().render({'text': 'Пост', 'items': [1, 2.5]})
+        assert FastJSONParser().parse(io.BytesIO(body)) == (
+            JSONParser().parse(io.BytesIO(body))
+        )
+
+    def test_parse_error(self, backend):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"text": '))
+
+
+class TestFastJSONApi:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_create_with_json(self, user_client):
+        response = user_client.post(
+            '/api/v1/posts/', data={'text': 'Пост'}, format='json'
+        )
+        assert response.status_code == 201
+        assert response.json()['text'] == 'Пост'
@@ -0,0 +1,91 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from posts.models import Group, ImageUpload, Post
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Реплика — отдельный файл SQLite, копия основной базы по запросу."""
+    path = tmp_path / 'replica.sqlite3'
+    connections.databases['replica'] = {
+        **connections.databases['default'], 'NAME': str(path)
+    }
+    settings.DATABASE_REPLICAS = ['replica']
+
+    def sync():
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+
+    yield sync
+    connections['replica'].close()
+    del connections['replica']
+    del connections.databases['replica']
+
+
+@pytest.fixture
+def another_client(another_user):
+    client = APIClient()
+    token = Token.objects.create(user=another_user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+def texts(response):
+    assert response.status_code == HTTPStatus.OK
+    return {post['text'] for post in response.json()}
+
+
+class TestReadReplicas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_safe_requests_read_replica(self, user_client, another_client,
+                                        user, replica):
+        Post.objects.create(text='Старый', author=user)
+        replica()
+        Post.objects.create(text='Новый', author=user)
+        Group.objects.create(title='Группа', slug='group')
+
+        response = user_client.get('/api/v1/posts/')
+        assert texts(response) == {'Старый'}, (
+            'Проверьте, что список постов читается с реплики.'
+        )
+        assert 'ETag' not in response, (
+            'Проверьте, что ответ реплики сразу после изменений не '
+            'получает ETag текущей версии.'
+        )
+        assert len(user_client.get('/api/v1/groups/').json()) == 1, (
+            'Проверьте, что кэш групп заполняется из основной базы.'
+        )
+
+        upload = ImageUpload.objects.create(
+            owner=user, filename='a.png', size=10
+        )
+        response = user_client.get(f'/api/v1/uploads/{upload.id}/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что на реплику уходят только отмеченные view.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_read_after_write_uses_primary(self, user_client, another_client,
+                                           replica):
+        replica()
+        response = user_client.post('/api/v1/posts/', data={'text': 'Мой'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert Post.objects.using('replica').count() == 0, (
+            'Проверьте, что запись идёт в основную базу.'
+        )
+
+        assert texts(user_client.get('/api/v1/posts/')) == {'Мой'}, (
+            'Проверьте, что после записи клиент читает из основной базы.'
+        )
+        assert texts(another_client.get('/api/v1/posts/')) == set(), (
+            'Проверьте, что остальные клиенты читают с реплики.'
+        )
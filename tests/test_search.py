@@ -0,0 +1,43 @@
+import pytest
+
+from posts.models import Post
+
+
+class TestPostSearch:
+
+    def search(self, client, query):
+        response = client.get('/api/v1/posts/', {'search': query})
+        assert response.status_code == 200
+        return {item['id'] for item in response.json()}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_search_finds_words(self, user_client, user):
+        cats = Post.objects.create(text='Коты спят на окне', author=user)
+        dogs = Post.objects.create(text='Собаки спят у двери', author=user)
+
+        assert self.search(user_client, 'спят') == {cats.id, dogs.id}
+        assert self.search(user_client, 'коты окне') == {cats.id}, (
+            'Проверьте, что `?search=` возвращает посты, содержащие все '
+            'слова запроса.'
+        )
+        assert self.search(user_client, 'жирафы') == set()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_index_follows_updates_and_deletes(self, user_client, user):
+        post = Post.objects.create(text='Старый текст', author=user)
+        post.text = 'Новый текст'
+        post.save()
+
+        assert self.search(user_client, 'старый') == set(), (
+            'Проверьте, что поисковый индекс обновляется при изменении поста.'
+        )
+        assert self.search(user_client, 'новый') == {post.id}
+
+        post.delete()
+        assert self.search(user_client, 'новый') == set(), (
+            'Проверьте, что поисковый индекс обновляется при удалении поста.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_search_without_words(self, user_client, post):
+        assert self.search(user_client, '"*') == set()
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class TestSparseFields:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_fields(self, user_client, post, another_post):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(
+                '/api/v1/posts/?fields=id,author,pub_date'
+            )
+        assert response.status_code == HTTPStatus.OK
+        for item in response.json():
+            assert set(item) == {'id', 'author', 'pub_date'}, (
+                'Проверьте, что `?fields=` оставляет в ответе только '
+                'запрошенные поля.'
+            )
+        assert response.json()[0]['author'] == post.author.username
+
+        post_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "posts_post"' in query['sql']
+        ]
+        assert len(post_queries) == 1
+        assert '"posts_post"."text"' not in post_queries[0], (
+            'Проверьте, что `?fields=` ограничивает и запрос к БД.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_posts_fields_with_cursor(self, user_client, post, another_post):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/posts/?fields=id&limit=1')
+        data = response.json()
+        assert [set(item) for item in data['results']] == [{'id'}]
+        assert data['next']
+        assert len([
+            query for query in context.captured_queries
+            if 'posts_post' in query['sql']
+        ]) == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_comments_fields(self, user_client, post, comment_1_post):
+        response = user_client.get(
+            f'/api/v1/posts/{post.id}/comments/{comment_1_post.id}/'
+            '?fields=id,text'
+        )
+        assert response.json() == {
+            'id': comment_1_post.id, 'text': comment_1_post.text
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_unknown_field(self, user_client, post):
+        response = user_client.get('/api/v1/posts/?fields=id,password')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.django_db(transaction=True)
+    def test_fields_ignored_on_write(self, user_client):
+        response = user_client.post(
+            '/api/v1/posts/?fields=id', data={'text': 'Пост'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['text'] == 'Пост'
+
+
+class TestCompactFormat:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_compact_list(self, user_client, post, another_post):
+        response = user_client.get(
+            '/api/v1/posts/?fields=id,author&format=compact'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'fields': ['id', 'author'],
+            'rows': [
+                [post.id, post.author.username],
+                [another_post.id, another_post.author.username],
+            ],
+        }, (
+            'Проверьте, что `?format=compact` возвращает список в виде '
+            'массива массивов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_compact_paginated(self, user_client, post, another_post):
+        data = user_client.get(
+            '/api/v1/posts/?fields=id&format=compact&limit=1'
+        ).json()
+        assert data['results']['fields'] == ['id']
+        assert len(data['results']['rows']) == 1
+        assert data['next']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_compact_detail_unchanged(self, user_client, post):
+        data = user_client.get(
+            f'/api/v1/posts/{post.id}/?format=compact'
+        ).json()
+        assert data['id'] == post.id
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api import throttling
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates
+            },
+        }
+    return set_rates
+
+
+def anonymous_request():
+    request = Request(APIRequestFactory().get('/api/v1/groups/'))
+    request.user = AnonymousUser()
+    return request
+
+
+class TestThrottling:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_user_limit(self, user_client, another_user, rates):
+        rates(user='3/min')
+        for _ in range(3):
+            assert user_client.get('/api/v1/posts/').status_code == (
+                HTTPStatus.OK
+            )
+        response = user_client.get('/api/v1/posts/')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые запросы пользователя ограничиваются.'
+        )
+        assert int(response['Retry-After']) > 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_write_limit(self, user_client, rates):
+        rates(write='2/min')
+        for _ in range(2):
+            user_client.post('/api/v1/posts/', data={'text': 'Пост'})
+        response = user_client.post('/api/v1/posts/', data={'text': 'Пост'})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что для записи действует отдельный лимит.'
+        )
+        assert user_client.get('/api/v1/posts/').status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что лимит записи не ограничивает чтение.'
+
+    def test_bucket_refills(self, rates, monkeypatch):
+        rates(anon='2/min')
+        now = 1000.0
+        monkeypatch.setattr(throttling.time, 'time', lambda: now)
+        throttle = throttling.AnonBucketThrottle()
+        request = anonymous_request()
+        assert throttle.allow_request(request, None)
+        assert throttle.allow_request(request, None)
+        assert not throttle.allow_request(request, None)
+        assert throttle.wait() == pytest.approx(30)
+
+        now += 30
+        assert throttle.allow_request(request, None), (
+            'Проверьте, что ведро пополняется со временем.'
+        )
+        assert not throttle.allow_request(request, None)
+
+    def test_state_is_constant_size(self, rates):
+        from django.core.cache import cache
+
+        rates(anon='1000/min')
+        throttle = throttling.AnonBucketThrottle()
+        request = anonymous_request()
+        for _ in range(100):
+            throttle.allow_request(request, None)
+        tokens, _ = cache.get('throttle:anon:127.0.0.1')
+        assert tokens == pytest.approx(900, abs=1), (
+            'Проверьте, что на ключ хранится только число токенов и время.'
+        )
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+
+def token_queries(client, url='/api/v1/groups/'):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [
+        query for query in context.captured_queries
+        if 'authtoken_token' in query['sql']
+    ]
+
+
+class TestCachedTokenAuthentication:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_token_lookup_cached(self, user_client):
+        response, queries = token_queries(user_client)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 1
+
+        response, queries = token_queries(user_client)
+        assert response.status_code == HTTPStatus.OK
+        assert not queries, (
+            'Проверьте, что повторный запрос с тем же токеном не обращается '
+            'к таблице токенов.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_deleted_token_rejected(self, user_client, token):
+        token_queries(user_client)
+
+        Token.objects.filter(key=token).delete()
+
+        response, _ = token_queries(user_client)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после удаления токена запрос с ним отклоняется.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_deactivated_user_rejected(self, user_client, user):
+        token_queries(user_client)
+
+        user.is_active = False
+        user.save()
+
+        response, _ = token_queries(user_client)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после деактивации пользователя его токен '
+            'отклоняется.'
+        )
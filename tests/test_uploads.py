@@ -0,0 +1,178 @@
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from posts.models import ImageUpload
+
+CHUNK = 1024
+
+
+def image_bytes():
+    buffer = BytesIO()
+    Image.effect_noise((400, 300), 64).convert('RGB').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def send_chunk(client, upload_id, data, start, total):
+    return client.put(
+        f'/api/v1/uploads/{upload_id}/', data=data,
+        content_type='application/octet-stream',
+        HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(data) - 1}/{total}'
+    )
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_RUNNER = 'posts.images.run_inline'
+    return tmp_path
+
+
+def start_upload(client, size):
+    response = client.post(
+        '/api/v1/uploads/', data={'filename': 'big.png', 'size': size}
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    return response.json()['id']
+
+
+class TestImageUpload:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_resumable_upload(self, user_client, post, media):
+        data = image_bytes()
+        upload_id = start_upload(user_client, len(data))
+
+        for start in range(0, len(data) // 2, CHUNK):
+            response = send_chunk(
+                user_client, upload_id, data[start:start + CHUNK], start,
+                len(data)
+            )
+            assert response.status_code == HTTPStatus.OK
+
+        # Клиент потерял соединение и узнаёт, с какого места продолжить.
+        offset = user_client.get(f'/api/v1/uploads/{upload_id}/').json()[
+            'offset'
+        ]
+        assert 0 < offset < len(data)
+        response = send_chunk(
+            user_client, upload_id, data[:CHUNK], 0, len(data)
+        )
+        assert response.status_code == HTTPStatus.CONFLICT, (
+            'Проверьте, что часть с неверным смещением отклоняется '
+            'со статусом 409.'
+        )
+        assert response.json()['offset'] == offset
+
+        response = user_client.post(
+            f'/api/v1/uploads/{upload_id}/complete/', data={'post': post.id}
+        )
+        assert response.status_code == HTTPStatus.CONFLICT, (
+            'Проверьте, что незавершённую загрузку нельзя прикрепить к посту.'
+        )
+
+        for start in range(offset, len(data), CHUNK):
+            send_chunk(
+                user_client, upload_id, data[start:start + CHUNK], start,
+                len(data)
+            )
+        response = user_client.post(
+            f'/api/v1/uploads/{upload_id}/complete/', data={'post': post.id}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['image_variants'], (
+            'Проверьте, что после загрузки строятся копии изображения.'
+        )
+
+        post.refresh_from_db()
+        with post.image.open('rb') as file:
+            assert file.read() == data, (
+                'Проверьте, что файл собирается из частей без искажений.'
+            )
+        assert not ImageUpload.objects.exists()
+        assert not list((media / 'uploads').iterdir()), (
+            'Проверьте, что временный файл удаляется после загрузки.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_not_an_image_rejected(self, user_client, media):
+        upload_id = start_upload(user_client, 4 * CHUNK)
+        response = send_chunk(
+            user_client, upload_id, b'x' * CHUNK, 0, 4 * CHUNK
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что формат файла проверяется по первой части.'
+        )
+        assert not ImageUpload.objects.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_limits(self, user_client, media, settings):
+        settings.UPLOAD_MAX_SIZE = 10 * CHUNK
+        settings.UPLOAD_CHUNK_MAX_SIZE = CHUNK
+        response = user_client.post(
+            '/api/v1/uploads/', data={'filename': 'big.png', 'size': 11 * CHUNK}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        upload_id = start_upload(user_client, 10 * CHUNK)
+        response = send_chunk(
+            user_client, upload_id, b'x' * 2 * CHUNK, 0, 10 * CHUNK
+        )
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        response = send_chunk(user_client, upload_id, b'x', 0, 20 * CHUNK)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.django_db(transaction=True)
+    def test_filename(self, user_client, media):
+        response = user_client.post('/api/v1/uploads/', data={
+            'filename': '../../../tmp/my photo.PNG', 'size': 10
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['filename'] == 'my_photo.PNG', (
+            'Проверьте, что из имени файла убирается путь.'
+        )
+        for filename in ('../', '..', 'script.py', 'image'):
+            response = user_client.post('/api/v1/uploads/', data={
+                'filename': filename, 'size': 10
+            })
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что имя файла `{filename}` отклоняется.'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_empty_body(self, user_client, media):
+        upload_id = start_upload(user_client, 4 * CHUNK)
+        response = user_client.put(
+            f'/api/v1/uploads/{upload_id}/', data=b'',
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes 0-{CHUNK - 1}/{4 * CHUNK}'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что часть с пустым телом отклоняется со статусом 400.'
+        )
+        assert ImageUpload.objects.get(id=upload_id).offset == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_foreign_upload_and_post(self, user_client, client, another_user,
+                                     another_post, media):
+        upload = ImageUpload.objects.create(
+            owner=another_user, filename='a.png', size=10
+        )
+        response = user_client.get(f'/api/v1/uploads/{upload.id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что чужие загрузки недоступны.'
+        )
+        assert client.post(
+            '/api/v1/uploads/', data={'filename': 'a.png', 'size': 10}
+        ).status_code == HTTPStatus.UNAUTHORIZED
+
+        data = image_bytes()
+        upload_id = start_upload(user_client, len(data))
+        send_chunk(user_client, upload_id, data, 0, len(data))
+        response = user_client.post(
+            f'/api/v1/uploads/{upload_id}/complete/',
+            data={'post': another_post.id}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,39 @@
+"""Асинхронные обёртки view для запуска под ASGI.
+
+Синхронный view под ASGI Django выполняет в единственном общем потоке
+(thread_sensitive), и запросы к API обрабатываются по одному. Обёртка
+отправляет безопасные запросы в пул потоков event loop, так что чтения
+с ожиданием БД идут параллельно. Соединения с БД в потоках пула
+принадлежат этим потокам, поэтому закрываются и проверяются здесь же,
+как это делают сигналы запроса в обычном потоке Django. Небезопасные
+запросы остаются в общем потоке, как у обычного синхронного view.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from rest_framework.permissions import SAFE_METHODS
+
+from posts.database import check_persistent_connections
+
+
+def run_view(view, request, *args, **kwargs):
+    close_old_connections()
+    check_persistent_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        run = sync_to_async(
+            run_view, thread_sensitive=request.method not in SAFE_METHODS
+        )
+        return await run(view, request, *args, **kwargs)
+    return wrapper
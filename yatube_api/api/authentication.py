@@ -0,0 +1,35 @@
+import copy
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+from .cache import LRUCache
+
+token_cache = LRUCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, timeout=settings.TOKEN_CACHE_TIMEOUT
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication с кэшем `ключ → (пользователь, токен)`.
+
+    Кэш живёт в памяти процесса; удаление токена и изменение пользователя
+    сбрасывают записи через сигналы, а в других процессах запись устаревает
+    не позже чем через TOKEN_CACHE_TIMEOUT секунд.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            cached = super().authenticate_credentials(key)
+            token_cache.set(key, cached)
+        user, token = cached
+        return copy.copy(user), token
+
+
+def forget_token(key):
+    token_cache.delete(key)
+
+
+def forget_user(user_id):
+    token_cache.delete_where(lambda cached: cached[0].pk == user_id)
@@ -0,0 +1,136 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+GROUPS_LIST_KEY = 'api:groups:list:{generation}:{query}'
+GROUP_DETAIL_KEY = 'api:groups:{pk}'
+GENERATION_KEY = 'api:generation:{name}'
+
+
+def invalidate_group(pk):
+    """Сбрасывает кэш группы; списки групп — `bump_generation('groups')`."""
+    cache.delete(GROUP_DETAIL_KEY.format(pk=pk))
+
+
+def get_generation(name):
+    """Поколение закэшированных ответов name для ключей кэша.
+
+    Поколение не истекает и меняется только `bump_generation`, так что
+    ключи остаются прежними до изменения данных. Вытесненное поколение
+    заводится заново новым значением, а не повторяет старое.
+    """
+    key = GENERATION_KEY.format(name=name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(name):
+    key = GENERATION_KEY.format(name=name)
+    transaction.on_commit(lambda: cache.set(key, uuid.uuid4().hex, None))
+
+
+class LRUCache:
+    """Потокобезопасный LRU-кэш процесса с ограничением размера и TTL."""
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [
+                key for key, (value, _) in self._data.items()
+                if predicate(value)
+            ]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+VERSION_KEY = 'api:version:{scope}'
+
+
+def touch(*scopes):
+    """Отмечает изменение ресурсов: меняет их ETag и Last-Modified.
+
+    Внутри транзакции метки обновляются только после её фиксации: иначе
+    параллельный GET успел бы получить старые данные под новой меткой.
+    """
+    def bump():
+        now = time.time()
+        cache.set_many(
+            {VERSION_KEY.format(scope=scope): now for scope in scopes},
+            settings.API_VERSION_TIMEOUT
+        )
+
+    transaction.on_commit(bump)
+
+
+def get_versions(scopes):
+    """Метки последних изменений ресурсов в порядке scopes.
+
+    Отсутствующая метка (холодный кэш, вытеснение или истёкший
+    API_VERSION_TIMEOUT) заводится текущим временем: клиент получит полный
+    ответ, но не устаревший 304.
+    """
+    keys = [VERSION_KEY.format(scope=scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, settings.API_VERSION_TIMEOUT)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, time.time()) for key in keys]
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def comments_scope(post_id):
+    return f'post:{post_id}:comments'
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def touch_comments(post_id):
+    """Комментарии входят и в пост (comment_count), и в список постов."""
+    touch('posts', post_scope(post_id), comments_scope(post_id))
@@ -0,0 +1,32 @@
+"""Маршрутизация чтения на реплики базы данных.
+
+На реплики уходят только чтения, которые разрешила ReplicaMiddleware
+для текущего запроса. Запись всегда идёт в основную базу, и после неё
+чтения до конца запроса тоже возвращаются туда: реплика может ещё не
+получить только что записанные данные.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+use_replica = ContextVar('use_replica', default=False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if use_replica.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        use_replica.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
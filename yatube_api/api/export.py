@@ -0,0 +1,47 @@
+import json
+from itertools import groupby
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from .serializers import CommentSerializer, PostSerializer
+from posts.models import Comment, Post
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+def iter_posts_ndjson(chunk_size=EXPORT_CHUNK_SIZE):
+    """Выгружает все посты с комментариями построчно в формате NDJSON.
+
+    Посты читаются курсором порциями по chunk_size, комментарии для каждой
+    порции загружаются одним запросом, поэтому память не зависит от размера
+    таблиц.
+    """
+    batch = []
+    posts = Post.objects.select_related('author', 'group').order_by('id')
+    for post in posts.iterator(chunk_size=chunk_size):
+        batch.append(post)
+        if len(batch) == chunk_size:
+            yield from _serialize_batch(batch)
+            batch = []
+    if batch:
+        yield from _serialize_batch(batch)
+
+
+def _serialize_batch(posts):
+    comments = (
+        Comment.objects.select_related('author')
+        .filter(post_id__in=[post.id for post in posts])
+        .order_by('post_id', 'created', 'id')
+    )
+    comments_by_post = {
+        post_id: list(post_comments)
+        for post_id, post_comments in groupby(
+            comments, key=lambda comment: comment.post_id
+        )
+    }
+    for post in posts:
+        data = PostSerializer(post).data
+        data['comments'] = CommentSerializer(
+            comments_by_post.get(post.id, ()), many=True
+        ).data
+        yield json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + '\n'
@@ -0,0 +1,114 @@
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .serializers import ImageVariantsField
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+class ValuesSerializer:
+    """Быстрый read-only путь для списков: строки `.values()` → словари.
+
+    Строится по обычному сериализатору: для каждого поля один раз
+    вычисляются ключ в `.values()` и функция преобразования значения, так что
+    на каждую строку приходится одно построение словаря без вызова
+    `to_representation` полей. Результат совпадает с выводом сериализатора.
+    """
+
+    def __init__(self, serializer):
+        self.fields = [
+            (name,) + self.accessor(field)
+            for name, field in serializer.fields.items()
+        ]
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """ValuesSerializer или None, если поле нельзя прочитать из values."""
+        try:
+            return cls(serializer)
+        except UnsupportedField:
+            return None
+
+    def accessor(self, field):
+        if field.source == '*':
+            raise UnsupportedField(field)
+        lookup = field.source.replace('.', '__')
+        if isinstance(field, serializers.SlugRelatedField):
+            return f'{lookup}__{field.slug_field}', None
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return lookup, None
+        if isinstance(field, serializers.DateTimeField):
+            return lookup, self.datetime_converter(field)
+        if isinstance(field, serializers.FileField):
+            return lookup, self.file_converter(field)
+        if isinstance(field, ImageVariantsField):
+            build_url = field.url_builder()
+            return lookup, lambda value: {
+                variant: build_url(name) for variant, name in value.items()
+            }
+        if isinstance(field, (
+            serializers.IntegerField, serializers.CharField,
+            serializers.BooleanField
+        )):
+            return lookup, None
+        raise UnsupportedField(field)
+
+    def datetime_converter(self, field):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        field_timezone = getattr(field, 'timezone', field.default_timezone())
+        if (
+            output_format is None or output_format.lower() != ISO_8601
+            or field_timezone is None
+        ):
+            return field.to_representation
+
+        def convert(value):
+            if not value:
+                return None
+            if timezone.is_naive(value):
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+
+        return convert
+
+    def file_converter(self, field):
+        use_url = getattr(
+            field, 'use_url', api_settings.UPLOADED_FILES_USE_URL
+        )
+        if not use_url:
+            return lambda value: value or None
+        model_field = field.parent.Meta.model._meta.get_field(field.source)
+        storage = model_field.storage
+        request = field.context.get('request')
+
+        def convert(value):
+            if not value:
+                return None
+            url = storage.url(value)
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+
+        return convert
+
+    def values(self, queryset, *extra):
+        lookups = [lookup for _, lookup, _ in self.fields]
+        lookups += [name for name in extra if name not in lookups]
+        return queryset.values(*lookups)
+
+    def to_representation(self, rows):
+        fields = self.fields
+        return [
+            {
+                name: row[lookup] if convert is None
+                else convert(row[lookup])
+                for name, lookup, convert in fields
+            }
+            for row in rows
+        ]
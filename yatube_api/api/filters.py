@@ -0,0 +1,91 @@
+import re
+from datetime import datetime, time
+
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from posts.search import search_posts
+
+
+class PostSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по тексту постов: `?search=слова`."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_posts(queryset, query)
+
+
+class PostFilter(BaseFilterBackend):
+    """Фильтры списка постов.
+
+    `?group=` — id или slug группы, `?author=` — username автора,
+    `?pub_date_after=` и `?pub_date_before=` — дата или дата и время
+    в формате ISO 8601, границы включаются.
+    """
+
+    date_params = (
+        ('pub_date_after', 'pub_date__gte', time.min),
+        ('pub_date_before', 'pub_date__lte', time.max),
+    )
+    max_id = models.BigIntegerField.MAX_BIGINT
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        group = params.get('group')
+        if group:
+            if re.fullmatch(r'[0-9]+', group):
+                if not 0 < int(group) <= self.max_id:
+                    raise ValidationError({'group': [
+                        f'Id группы должен быть от 1 до {self.max_id}.'
+                    ]})
+                queryset = queryset.filter(group_id=group)
+            else:
+                queryset = queryset.filter(group__slug=group)
+        author = params.get('author')
+        if author:
+            queryset = queryset.filter(author__username=author)
+        for param, lookup, day_time in self.date_params:
+            value = params.get(param)
+            if value:
+                queryset = queryset.filter(
+                    **{lookup: self.parse_moment(param, value, day_time)}
+                )
+        return queryset
+
+    def parse_moment(self, param, value, day_time):
+        try:
+            moment = parse_datetime(value)
+            if moment is None:
+                day = parse_date(value)
+                if day is None:
+                    raise ValueError
+                moment = datetime.combine(day, day_time)
+        except ValueError:
+            raise ValidationError(
+                {param: 'Укажите дату в формате ISO 8601.'}
+            )
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+
+class TieBreakOrderingFilter(OrderingFilter):
+    """`?ordering=-post_count`: к полю добавляется id в том же направлении.
+
+    Так порядок однозначен и читается по индексу `(поле, id)` без
+    сортировки в памяти.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or ordering[-1].lstrip('-') in ('id', 'pk'):
+            return ordering
+        descending = ordering[-1].startswith('-')
+        return [*ordering, '-id' if descending else 'id']
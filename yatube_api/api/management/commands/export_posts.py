@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from api.export import EXPORT_CHUNK_SIZE, iter_posts_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты с комментариями в формате NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o',
+            help='Файл для выгрузки. По умолчанию — стандартный вывод.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help='Количество постов, читаемых из БД за один раз.'
+        )
+
+    def handle(self, *args, output, chunk_size, **options):
+        lines = iter_posts_ndjson(chunk_size=chunk_size)
+        if output is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(output, 'w', encoding='utf-8') as file:
+            file.writelines(lines)
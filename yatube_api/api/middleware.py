@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import SAFE_METHODS
+
+from .db_routers import use_replica
+
+REPLICA_PIN_KEY = 'api:replica-pin:{client}'
+
+
+def replica_pin_key(request):
+    """Ключ клиента: токен из Authorization или cookie сессии."""
+    credentials = request.META.get('HTTP_AUTHORIZATION') or (
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
+    if credentials:
+        client = hashlib.sha256(credentials.encode()).hexdigest()
+        return REPLICA_PIN_KEY.format(client=client)
+    return None
+
+
+class ReplicaMiddleware:
+    """Отправляет безопасные запросы к view с `read_replica = True`
+    на реплики.
+
+    После небезопасного запроса клиент на REPLICA_PIN_TIMEOUT секунд
+    закрепляется за основной базой, чтобы сразу видеть свои изменения,
+    пока реплики их догоняют. Отметка хранится в кэше по умолчанию,
+    поэтому с репликами settings требуют общий CACHE_BACKEND. Работает
+    и под WSGI, и под ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так же Django помечает асинхронный MiddlewareMixin.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = use_replica.set(self.replica_allowed(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+        self.pin_after_write(request)
+        return response
+
+    async def __acall__(self, request):
+        token = use_replica.set(self.replica_allowed(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_replica.reset(token)
+        self.pin_after_write(request)
+        return response
+
+    def replica_allowed(self, request):
+        if (
+            not settings.DATABASE_REPLICAS
+            or request.method not in SAFE_METHODS
+        ):
+            return False
+        try:
+            view = resolve(request.path_info).func
+        except Resolver404:
+            return False
+        if not getattr(getattr(view, 'cls', None), 'read_replica', False):
+            return False
+        key = replica_pin_key(request)
+        return not (key and cache.get(key))
+
+    def pin_after_write(self, request):
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            key = replica_pin_key(request)
+            if key:
+                cache.set(key, True, settings.REPLICA_PIN_TIMEOUT)
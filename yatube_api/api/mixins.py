@@ -0,0 +1,317 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .async_views import async_view
+from .cache import get_generation, get_versions
+from .db_routers import use_replica
+from .fast_serializers import ValuesSerializer
+
+
+class AsyncViewMixin:
+    """Асинхронные view вьюсета при settings.API_ASYNC_VIEWS (ASGI).
+
+    См. `api.async_views`: чтения выполняются в пуле потоков параллельно.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if settings.API_ASYNC_VIEWS:
+            return async_view(view)
+        return view
+
+
+class BatchRetrieveMixin:
+    """Несколько объектов за один запрос: `<list>/?ids=3,1,2`.
+
+    Объекты выбираются одним `in_bulk` из того же queryset, что и в
+    retrieve, с проверкой тех же объектных разрешений, и отдаются в
+    порядке запроса. Id, которых нет, перечисляются в `missing`.
+    """
+
+    ids_param = 'ids'
+    # Верхняя граница BigAutoField: большее число не влезет в запрос к БД.
+    max_id = models.BigIntegerField.MAX_BIGINT
+
+    def get_requested_ids(self):
+        value = self.request.query_params.get(self.ids_param)
+        if value is None:
+            return None
+        try:
+            ids = list(dict.fromkeys(
+                int(pk) for pk in value.split(',') if pk.strip()
+            ))
+        except ValueError:
+            raise ValidationError(
+                {self.ids_param: ['Ожидается список id через запятую.']}
+            )
+        if any(not 0 < pk <= self.max_id for pk in ids):
+            raise ValidationError({self.ids_param: [
+                f'Id должен быть от 1 до {self.max_id}.'
+            ]})
+        limit = settings.API_BATCH_IDS_LIMIT
+        if not ids or len(ids) > limit:
+            raise ValidationError({self.ids_param: [
+                f'Укажите от 1 до {limit} id.'
+            ]})
+        return ids
+
+    def list(self, request, *args, **kwargs):
+        ids = self.get_requested_ids()
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        found = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+        objects = [found[pk] for pk in ids if pk in found]
+        for obj in objects:
+            self.check_object_permissions(request, obj)
+        return Response({
+            'results': self.get_serializer(objects, many=True).data,
+            'missing': [pk for pk in ids if pk not in found],
+        })
+
+
+class BulkCreateMixin:
+    """Пакетное создание объектов: POST-запрос со списком на `<list>/bulk/`.
+
+    Список проверяется сериализатором с `many=True`; при ошибках ответ 400
+    содержит список ошибок по каждому элементу в порядке запроса. Все строки
+    записываются одним `bulk_create` в одной транзакции.
+    """
+
+    @action(detail=False, methods=('post',))
+    def bulk(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {'non_field_errors': ['Ожидается список объектов.']}
+            )
+        limit = settings.API_BULK_CREATE_LIMIT
+        if len(request.data) > limit:
+            raise ValidationError({'non_field_errors': [
+                f'За один запрос можно создать не более {limit} объектов.'
+            ]})
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            created = self.perform_bulk_create(serializer.validated_data)
+        return Response(
+            {'created': len(created)}, status=status.HTTP_201_CREATED
+        )
+
+    def perform_bulk_create(self, validated_data):
+        raise NotImplementedError
+
+
+class CachedResponseMixin:
+    """Отдаёт тела ответов list и retrieve из кэша Django.
+
+    Ключ списка включает строку запроса и поколение `cache_generation`
+    (см. `api.cache.get_generation`), так что все варианты списка
+    (сортировки, фильтры) устаревают одним `bump_generation`.
+    """
+
+    cache_list_key = None
+    cache_detail_key = None
+    cache_generation = None
+
+    def get_cache_timeout(self):
+        return None
+
+    def cached_data(self, key, render, request, *args, **kwargs):
+        data = cache.get(key)
+        if data is None:
+            # Кэш заполняется из основной базы: отстающая реплика
+            # закрепила бы в нём устаревший ответ на всё время жизни.
+            token = use_replica.set(False)
+            try:
+                data = render(request, *args, **kwargs).data
+            finally:
+                use_replica.reset(token)
+            cache.set(key, data, self.get_cache_timeout())
+        return Response(data)
+
+    def get_list_cache_key(self, request):
+        return self.cache_list_key.format(
+            generation=get_generation(self.cache_generation),
+            query=urlencode(sorted(request.query_params.lists()), doseq=True)
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_data(
+            self.get_list_cache_key(request), super().list,
+            request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_data(
+            self.cache_detail_key.format(pk=kwargs['pk']),
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified для list и retrieve.
+
+    Валидаторы строятся по меткам изменений из кэша (см. `api.cache.touch`),
+    поэтому ответ 304 на If-None-Match/If-Modified-Since отдаётся без
+    обращения к БД и сериализации. Подклассы задают области изменений в
+    `get_list_scopes` и `get_detail_scopes`; None отключает проверку.
+    """
+
+    def get_list_scopes(self):
+        return None
+
+    def get_detail_scopes(self):
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_list_scopes(), super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_detail_scopes(), super().retrieve,
+            request, *args, **kwargs
+        )
+
+    def conditional_response(self, scopes, render, request, *args, **kwargs):
+        if scopes is None:
+            return render(request, *args, **kwargs)
+        versions = get_versions(('authors',) + tuple(scopes))
+        etag = '"{}"'.format(hashlib.md5(':'.join(
+            [request.get_full_path(), request.accepted_media_type]
+            + [repr(version) for version in versions]
+        ).encode()).hexdigest())
+        version = max(versions)
+        response = get_conditional_response(request, etag=etag)
+        if response is None and self.not_modified_since(request, version):
+            response = HttpResponseNotModified()
+        if response is None:
+            response = render(request, *args, **kwargs)
+            if use_replica.get() and (
+                time.time() - version < settings.REPLICA_PIN_TIMEOUT
+            ):
+                # Реплика могла ещё не получить последние изменения: такой
+                # ответ нельзя подтверждать валидаторами текущей версии.
+                return response
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(version)
+        return response
+
+    @staticmethod
+    def not_modified_since(request, version):
+        """Проверка If-Modified-Since по точной метке изменения.
+
+        Заголовок хранит время с точностью до секунды, а метка дробная:
+        сравнение с ней самой, а не с округлённым Last-Modified, не даёт
+        устаревшего 304 после изменения в ту же секунду. If-None-Match,
+        если он передан, имеет приоритет.
+        """
+        if request.method not in ('GET', 'HEAD') or (
+            'HTTP_IF_NONE_MATCH' in request.META
+        ):
+            return False
+        since = parse_http_date_safe(
+            request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+        )
+        return since is not None and version <= since
+
+
+class SparseFieldsMixin:
+    """Ограничение полей ответа параметром `?fields=id,author,...`.
+
+    Для безопасных методов выбранные поля передаются сериализатору через
+    контекст, а запрос к БД ограничивается теми же полями через `.only()`.
+    `sparse_field_sources` сопоставляет поле сериализатора с полями модели.
+    """
+
+    fields_param = 'fields'
+    sparse_field_sources = {}
+
+    def get_sparse_field_names(self):
+        return set(self.get_serializer_class()().fields)
+
+    def get_requested_fields(self):
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+        self._requested_fields = None
+        value = self.request.query_params.get(self.fields_param)
+        if self.request.method not in permissions.SAFE_METHODS or not value:
+            return None
+        requested = [name.strip() for name in value.split(',')]
+        requested = [name for name in requested if name]
+        unknown = set(requested) - self.get_sparse_field_names()
+        if unknown:
+            raise ValidationError({self.fields_param: [
+                'Неизвестные поля: {}.'.format(', '.join(sorted(unknown)))
+            ]})
+        self._requested_fields = requested
+        return requested
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_requested_fields()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = self.get_requested_fields()
+        if not requested:
+            return queryset
+        only = {'id'}
+        for name in requested:
+            only.update(self.sparse_field_sources.get(name, (name,)))
+        # Поля сортировки пагинатора нужны для построения курсора.
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        only.update(field.lstrip('-') for field in ordering)
+        related = {field.split('__')[0] for field in only if '__' in field}
+        return queryset.select_related(None).select_related(
+            *related
+        ).only(*only)
+
+
+class FastListMixin:
+    """list через ValuesSerializer, без создания экземпляров моделей.
+
+    Если сериализатор содержит поле, которое нельзя прочитать из `.values()`,
+    используется обычный сериализатор. `check_empty_list` вызывается для
+    пустого результата и может, например, вернуть 404.
+    """
+
+    def check_empty_list(self):
+        pass
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        fast = ValuesSerializer.for_serializer(self.get_serializer())
+        if fast is not None:
+            ordering = getattr(self.paginator, 'ordering', None) or ()
+            queryset = fast.values(
+                queryset, *(field.lstrip('-') for field in ordering)
+            )
+        page = self.paginate_queryset(queryset)
+        items = list(queryset) if page is None else page
+        if not items:
+            self.check_empty_list()
+        if fast is not None:
+            data = fast.to_representation(items)
+        else:
+            data = self.get_serializer(items, many=True).data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,27 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """Keyset-пагинация, включаемая параметром `cursor` или `limit`.
+
+    Без этих параметров список отдаётся целиком, как и раньше.
+    """
+
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not {
+            self.cursor_query_param, self.page_size_query_param
+        }.intersection(request.query_params):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class PostCursorPagination(OptionalCursorPagination):
+    ordering = ('-pub_date', '-id')
+
+
+class CommentCursorPagination(OptionalCursorPagination):
+    ordering = ('created', 'id')
@@ -0,0 +1,72 @@
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Вывод совпадает с JSONRenderer: datetime, Decimal и прочие типы, которые
+    orjson не сериализует сам так же, передаются в JSONEncoder DRF.
+    Форматирование с отступами, ASCII-вывод и всё, с чем orjson не
+    справился, рендерятся стандартной реализацией.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(
+                data, default=encoders.JSONEncoder().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        # Как и JSONRenderer, экранируем U+2028 и U+2029.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029'
+            )
+        return ret
+
+
+class CompactJSONRenderer(FastJSONRenderer):
+    """Списки объектов в виде `{"fields": [...], "rows": [[...], ...]}`.
+
+    Выбирается через `?format=compact` или заголовок Accept. Имена полей
+    передаются один раз, а не в каждом объекте. Для постраничных ответов
+    сжимается `results`, остальные данные отдаются как есть.
+    """
+
+    media_type = 'application/vnd.yatube.compact+json'
+    format = 'compact'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            data = dict(data, results=self.to_rows(data['results']))
+        elif isinstance(data, list):
+            data = self.to_rows(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+    @staticmethod
+    def to_rows(items):
+        if not all(isinstance(item, dict) for item in items):
+            return items
+        fields = list(items[0]) if items else []
+        return {
+            'fields': fields,
+            'rows': [[item.get(name) for name in fields] for item in items],
+        }
@@ -1,25 +1,85 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
 
-from posts.models import Comment, Group, Post
+from posts.models import Comment, Follow, Group, ImageUpload, Post, User
+from posts.uploads import ALLOWED_EXTENSIONS
+
+
+class SparseFieldsSerializerMixin:
+    """Оставляет только поля из `context['fields']`.
+
+    Ограничение действует на корневой сериализатор (или элементы корневого
+    списка) и не затрагивает вложенные.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if not requested or parent is not None:
+            return fields
+        return {
+            name: field for name, field in fields.items() if name in requested
+        }
+
+
+class ImageVariantsField(serializers.Field):
+    """Словарь `{копия: URL}` по именам файлов уменьшенных копий."""
 
+    def __init__(self, image_field='image', **kwargs):
+        self.image_field = image_field
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
 
-class PostSerializer(serializers.ModelSerializer):
+    def url_builder(self):
+        storage = self.parent.Meta.model._meta.get_field(
+            self.image_field
+        ).storage
+        request = self.context.get('request')
+        if request is None:
+            return storage.url
+        return lambda name: request.build_absolute_uri(storage.url(name))
+
+    def to_representation(self, value):
+        build_url = self.url_builder()
+        return {variant: build_url(name) for variant, name in value.items()}
+
+
+class PostSerializer(SparseFieldsSerializerMixin,
+                     serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Post
-        fields = '__all__'
+        exclude = ('fanned_out',)
+        read_only_fields = ('comment_count', 'last_commented_at')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('expand_comments'):
+            # Последние комментарии загружает PostViewSet одним prefetch.
+            fields['comments'] = CommentSerializer(
+                source='latest_comments', many=True, read_only=True
+            )
+        return fields
 
 
 class GroupSerializer(serializers.ModelSerializer):
     class Meta:
         model = Group
         fields = '__all__'
+        read_only_fields = ('post_count', 'comment_count', 'last_activity')
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
@@ -28,3 +88,63 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = '__all__'
         read_only_fields = ('post',)
+
+
+class FollowSerializer(serializers.ModelSerializer):
+    user = serializers.SlugRelatedField(
+        read_only=True, slug_field='username'
+    )
+    following = serializers.SlugRelatedField(
+        queryset=User.objects.all(), slug_field='username'
+    )
+
+    class Meta:
+        model = Follow
+        fields = ('id', 'user', 'following')
+
+    def validate_following(self, value):
+        if value.pk == self.context['request'].user.pk:
+            raise serializers.ValidationError(
+                'Нельзя подписаться на самого себя.'
+            )
+        if Follow.objects.filter(
+            user_id=self.context['request'].user.pk, following=value
+        ).exists():
+            raise serializers.ValidationError(
+                'Вы уже подписаны на этого автора.'
+            )
+        return value
+
+
+class ImageUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImageUpload
+        fields = ('id', 'filename', 'size', 'offset', 'created')
+        read_only_fields = ('offset', 'created')
+
+    def validate_filename(self, value):
+        # Имя станет именем файла в хранилище: путь и недопустимые символы
+        # отбрасываются сразу, а не при прикреплении уже загруженного файла.
+        name = os.path.basename(value.replace('\\', '/')).strip()
+        if name in ('', '.', '..'):
+            raise serializers.ValidationError('Укажите имя файла.')
+        name = Post._meta.get_field('image').storage.get_valid_name(name)
+        if os.path.splitext(name)[1].lower() not in ALLOWED_EXTENSIONS:
+            raise serializers.ValidationError(
+                'Допустимые расширения: {}.'.format(
+                    ', '.join(ALLOWED_EXTENSIONS)
+                )
+            )
+        return name
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                'Размер файла должен быть от 1 до '
+                f'{settings.UPLOAD_MAX_SIZE} байт.'
+            )
+        return value
+
+
+class ImageUploadCompleteSerializer(serializers.Serializer):
+    post = serializers.PrimaryKeyRelatedField(queryset=Post.objects.all())
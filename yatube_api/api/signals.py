@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_token, forget_user
+from .cache import (
+    bump_generation, group_scope, invalidate_group, post_scope, touch,
+    touch_comments
+)
+from posts.feeds import forget_feed
+from posts.models import Comment, Follow, Group, Post, User
+from posts.signals import group_stats_changed
+
+
+@receiver((post_save, post_delete), sender=Group)
+def drop_group_cache(sender, instance, **kwargs):
+    invalidate_group(instance.pk)
+    bump_generation('groups')
+    touch('groups', group_scope(instance.pk))
+
+
+@receiver(group_stats_changed)
+def drop_group_stats_cache(sender, group_ids, **kwargs):
+    # Списки групп не сбрасываются на каждую запись в группе: счётчики
+    # в них обновляются с истечением GROUPS_CACHE_TIMEOUT.
+    for pk in group_ids:
+        invalidate_group(pk)
+    touch(*map(group_scope, group_ids))
+
+
+@receiver((post_save, post_delete), sender=Post)
+def touch_post(sender, instance, **kwargs):
+    touch('posts', post_scope(instance.pk))
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def touch_comment(sender, instance, **kwargs):
+    touch_comments(instance.post_id)
+
+
+@receiver((post_save, post_delete), sender=Follow)
+def rebuild_feed(sender, instance, **kwargs):
+    forget_feed(instance.user_id)
+
+
+@receiver((post_save, post_delete), sender=Token)
+def drop_token_cache(sender, instance, **kwargs):
+    forget_token(instance.key)
+
+
+@receiver((post_save, post_delete), sender=User)
+def drop_user_tokens_cache(sender, instance, update_fields=None, **kwargs):
+    forget_user(instance.pk)
+    if update_fields != frozenset({'last_login'}):
+        # Имя пользователя входит в представление постов и комментариев.
+        touch('authors')
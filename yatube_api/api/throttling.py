@@ -0,0 +1,103 @@
+"""Ограничение частоты запросов алгоритмом token bucket.
+
+В отличие от SimpleRateThrottle, который хранит список времён всех
+запросов окна, на каждый ключ хранится одна пара (токены, время), так
+что память и работа на запрос не зависят от лимита. Состояние лежит в
+кэше Django: общий бэкенд (Redis, Memcached) делит лимиты между
+процессами, LocMemCache по умолчанию и в тестах — в пределах процесса.
+
+Чтение и запись ведра не атомарны: при одновременных запросах одного
+клиента несколько из них могут пройти сверх лимита. Для защиты от
+перегрузки этого достаточно, и проверка стоит один get и один set.
+"""
+import time
+
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ведро на `rate` запросов за период, пополняемое равномерно.
+
+    Лимит берётся из DEFAULT_THROTTLE_RATES по `scope`, ключ клиента —
+    из `get_client_ident`; None в любом из них отключает проверку.
+    """
+
+    scope = None
+    cache_format = 'throttle:{scope}:{ident}'
+
+    def __init__(self):
+        self.wait_time = None
+
+    def parse_rate(self, rate):
+        if rate is None:
+            return None, None
+        count, period = rate.split('/')
+        return int(count), PERIODS[period[0]]
+
+    def get_client_ident(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        capacity, period = self.parse_rate(
+            api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        )
+        ident = capacity and self.get_client_ident(request)
+        if ident is None or not capacity:
+            return True
+        key = self.cache_format.format(scope=self.scope, ident=ident)
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * capacity / period)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        else:
+            self.wait_time = (1 - tokens) * period / capacity
+        # За period простоя ведро наполняется, и запись больше не нужна.
+        cache.set(key, (tokens, now), period)
+        return allowed
+
+    def wait(self):
+        return self.wait_time
+
+
+class AnonBucketThrottle(TokenBucketThrottle):
+    scope = 'anon'
+
+    def get_client_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    scope = 'user'
+
+    def get_client_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class WriteBucketThrottle(TokenBucketThrottle):
+    """Отдельный, более строгий лимит на изменяющие запросы."""
+
+    scope = 'write'
+
+    def get_client_ident(self, request):
+        if request.method in SAFE_METHODS:
+            return None
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return self.get_ident(request)
+
+
+class UploadBucketThrottle(WriteBucketThrottle):
+    """Лимит записи для загрузки частями: один файл — много запросов."""
+
+    scope = 'upload'
@@ -1,8 +1,14 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from rest_framework.authtoken.views import obtain_auth_token
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView, TokenRefreshView, TokenVerifyView
+)
 
-from .views import CommentViewSet, GroupViewSet, PostViewSet
+from .views import (
+    CommentViewSet, ExportPostsView, FeedView, FollowViewSet, GroupViewSet,
+    ImageUploadViewSet, PostViewSet
+)
 
 router_v1 = DefaultRouter()
 router_v1.register(r'posts', PostViewSet, basename='posts')
@@ -12,8 +18,19 @@ router_v1.register(
     CommentViewSet,
     basename='comments'
 )
+router_v1.register(r'uploads', ImageUploadViewSet, basename='uploads')
+router_v1.register(r'follow', FollowViewSet, basename='follow')
 
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/api-token-auth/', obtain_auth_token, name='api_token_auth'),
+    path(
+        'v1/jwt/create/', TokenObtainPairView.as_view(), name='jwt_create'
+    ),
+    path(
+        'v1/jwt/refresh/', TokenRefreshView.as_view(), name='jwt_refresh'
+    ),
+    path('v1/jwt/verify/', TokenVerifyView.as_view(), name='jwt_verify'),
+    path('v1/export/posts/', ExportPostsView.as_view(), name='export_posts'),
+    path('v1/feed/', FeedView.as_view(), name='feed'),
 ]
\ No newline at end of file
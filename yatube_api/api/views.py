@@ -1,36 +1,393 @@
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
-from rest_framework import permissions, viewsets
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
+from .cache import (
+    GROUP_DETAIL_KEY, GROUPS_LIST_KEY, comments_scope, group_scope,
+    post_scope, touch, touch_comments
+)
+from .export import iter_posts_ndjson
+from .filters import PostFilter, PostSearchFilter, TieBreakOrderingFilter
+from .mixins import (
+    AsyncViewMixin, BatchRetrieveMixin, BulkCreateMixin, CachedResponseMixin,
+    ConditionalGetMixin, FastListMixin, SparseFieldsMixin
+)
+from .pagination import CommentCursorPagination, PostCursorPagination
 from .permissions import IsOwnerOrReadOnly
-from .serializers import CommentSerializer, GroupSerializer, PostSerializer
-from posts.models import Group, Post
+from .serializers import (
+    CommentSerializer, FollowSerializer, GroupSerializer,
+    ImageUploadCompleteSerializer, ImageUploadSerializer, PostSerializer
+)
+from .throttling import UploadBucketThrottle, UserBucketThrottle
+from posts import feeds, uploads
+from posts.images import schedule_variants
+from posts.models import Comment, Follow, Group, ImageUpload, Post
+from posts.signals import refresh_group_stats
+
 
+def parse_id(value):
+    """Приводит id из URL к каноническому виду или возвращает None."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
-class PostViewSet(viewsets.ModelViewSet):
-    queryset = Post.objects.all()
+
+class PostViewSet(AsyncViewMixin, ConditionalGetMixin, SparseFieldsMixin,
+                  BatchRetrieveMixin, FastListMixin, BulkCreateMixin,
+                  viewsets.ModelViewSet):
+    queryset = Post.objects.select_related('author', 'group')
     serializer_class = PostSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrReadOnly)
+    pagination_class = PostCursorPagination
+    read_replica = True
+    filter_backends = (PostSearchFilter, PostFilter)
+    sparse_field_sources = {
+        'author': ('author__username',),
+        'comments': (),
+    }
+    comments_limit = 3
+    max_comments_limit = 20
+
+    def get_comments_limit(self):
+        """N из `?expand=comments&comments_limit=N` или None без expand."""
+        if hasattr(self, '_comments_limit'):
+            return self._comments_limit
+        self._comments_limit = None
+        params = self.request.query_params
+        expand = {
+            name.strip() for name in params.get('expand', '').split(',')
+        } - {''}
+        if expand - {'comments'}:
+            raise ValidationError(
+                {'expand': ['Поддерживается только `comments`.']}
+            )
+        if not expand or self.request.method not in permissions.SAFE_METHODS:
+            return None
+        limit = parse_id(params.get('comments_limit', self.comments_limit))
+        if limit is None or not 0 < limit <= self.max_comments_limit:
+            raise ValidationError({'comments_limit': [
+                f'Укажите число от 1 до {self.max_comments_limit}.'
+            ]})
+        self._comments_limit = limit
+        return limit
+
+    def expand_comments(self):
+        """Нужны ли комментарии: expand задан, а fields их не исключает."""
+        if self.get_comments_limit() is None:
+            return False
+        requested = self.get_requested_fields()
+        return not requested or 'comments' in requested
+
+    def get_sparse_field_names(self):
+        names = super().get_sparse_field_names()
+        if self.get_comments_limit() is not None:
+            names.add('comments')
+        return names
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.expand_comments():
+            return queryset
+        limit = self.get_comments_limit()
+        # Один запрос на всю страницу: для каждого поста по индексу
+        # (post, created, id) берутся id его последних limit комментариев.
+        latest = Comment.objects.filter(
+            post=OuterRef('post')
+        ).order_by('-created', '-id').values('id')[:limit]
+        return queryset.prefetch_related(Prefetch(
+            'comments',
+            queryset=Comment.objects.select_related('author').filter(
+                id__in=Subquery(latest)
+            ).order_by('-created', '-id'),
+            to_attr='latest_comments'
+        ))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand_comments'] = self.expand_comments()
+        return context
+
+    def get_list_scopes(self):
+        return ('posts',)
+
+    def get_detail_scopes(self):
+        post_id = parse_id(self.kwargs['pk'])
+        return None if post_id is None else (post_scope(post_id),)
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        followers = feeds.get_fanout_followers(self.request.user.pk)
+        post = serializer.save(
+            author_id=self.request.user.pk, fanned_out=followers is not None
+        )
+        if followers:
+            feeds.fan_out([post], followers)
+        if post.image:
+            schedule_variants(post.pk)
+
+    def perform_update(self, serializer):
+        if 'image' not in serializer.validated_data:
+            serializer.save()
+            return
+        post = serializer.save(image_variants={})
+        if post.image:
+            schedule_variants(post.pk)
+
+    def perform_bulk_create(self, validated_data):
+        followers = feeds.get_fanout_followers(self.request.user.pk)
+        posts = Post.objects.bulk_create(
+            Post(
+                author_id=self.request.user.pk,
+                fanned_out=followers is not None, **attrs
+            )
+            for attrs in validated_data
+        )
+        if followers:
+            feeds.fan_out(posts, followers)
+        refresh_group_stats(post.group_id for post in posts)
+        touch('posts')
+        return posts
 
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
+class GroupViewSet(AsyncViewMixin, ConditionalGetMixin, CachedResponseMixin,
+                   FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
     permission_classes = (permissions.IsAuthenticated,)
+    cache_list_key = GROUPS_LIST_KEY
+    cache_detail_key = GROUP_DETAIL_KEY
+    cache_generation = 'groups'
+    read_replica = True
+    filter_backends = (TieBreakOrderingFilter,)
+    ordering_fields = ('post_count', 'comment_count', 'last_activity')
 
+    def get_cache_timeout(self):
+        return settings.GROUPS_CACHE_TIMEOUT
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def get_list_scopes(self):
+        return ('groups',)
+
+    def get_detail_scopes(self):
+        group_id = parse_id(self.kwargs['pk'])
+        return None if group_id is None else (group_scope(group_id),)
+
+
+class CommentViewSet(AsyncViewMixin, ConditionalGetMixin, SparseFieldsMixin,
+                     FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrReadOnly)
+    pagination_class = CommentCursorPagination
+    read_replica = True
+    sparse_field_sources = {'author': ('author__username',)}
 
     def get_post(self):
-        return get_object_or_404(Post, id=self.kwargs['post_id'])
+        if not hasattr(self, '_post'):
+            self._post = get_object_or_404(Post, id=self.kwargs['post_id'])
+        return self._post
+
+    def get_list_scopes(self):
+        post_id = parse_id(self.kwargs['post_id'])
+        return None if post_id is None else (comments_scope(post_id),)
+
+    get_detail_scopes = get_list_scopes
 
     def get_queryset(self):
-        return self.get_post().comments.all()
+        return Comment.objects.select_related('author').filter(
+            post_id=self.kwargs['post_id']
+        )
+
+    def check_empty_list(self):
+        # Пустой список допустим только для существующего поста.
+        self.get_post()
 
+    # Счётчики поста и группы обновляются сигналами комментария: в одной
+    # транзакции с созданием и удалением самого комментария.
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, post=self.get_post())
+        serializer.save(author_id=self.request.user.pk, post=self.get_post())
+
+    def perform_bulk_create(self, validated_data):
+        post = self.get_post()
+        comments = Comment.objects.bulk_create(
+            Comment(author_id=self.request.user.pk, post=post, **attrs)
+            for attrs in validated_data
+        )
+        Post.objects.filter(pk=post.pk).refresh_comment_stats()
+        refresh_group_stats([post.group_id])
+        touch_comments(post.pk)
+        return comments
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+
+class ExportPostsView(APIView):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request):
+        response = StreamingHttpResponse(
+            iter_posts_ndjson(), content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="posts.ndjson"'
+        )
+        return response
+
+
+class FollowViewSet(mixins.ListModelMixin, mixins.CreateModelMixin,
+                    mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    serializer_class = FollowSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_queryset(self):
+        return Follow.objects.filter(
+            user_id=self.request.user.pk
+        ).select_related('user', 'following')
+
+    def perform_create(self, serializer):
+        serializer.save(user_id=self.request.user.pk)
+
+
+class FeedView(APIView):
+    """Лента постов авторов из подписок, новые первыми.
+
+    Страницы задаются параметрами `limit` и `before` (id поста), ссылка
+    на следующую страницу приходит в `next`. См. `posts.feeds`.
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+    page_size = 20
+    max_page_size = 100
+
+    def get(self, request):
+        limit = parse_id(request.query_params.get('limit'))
+        limit = min(max(limit or self.page_size, 1), self.max_page_size)
+        before = parse_id(request.query_params.get('before'))
+        ids = feeds.get_feed_ids(request.user.pk, limit, before)
+        posts = Post.objects.select_related('author', 'group').in_bulk(ids)
+        next_url = None
+        if len(ids) == limit:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'before', ids[-1]
+            )
+        return Response({
+            'next': next_url,
+            'results': PostSerializer(
+                [posts[pk] for pk in ids if pk in posts], many=True,
+                context={'request': request}
+            ).data,
+        })
+
+
+class ImageUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                         mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """Загрузка изображения частями.
+
+    POST `uploads/` с `filename` и `size` начинает загрузку, PUT
+    `uploads/{id}/` с заголовком `Content-Range: bytes start-end/size` и
+    телом-частью дописывает данные, GET возвращает текущее смещение для
+    продолжения, POST `uploads/{id}/complete/` с `post` прикрепляет файл
+    к посту.
+    """
+
+    serializer_class = ImageUploadSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    throttle_classes = (UserBucketThrottle, UploadBucketThrottle)
+    content_range = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+    def get_queryset(self):
+        return ImageUpload.objects.filter(owner_id=self.request.user.pk)
+
+    def perform_create(self, serializer):
+        serializer.save(owner_id=self.request.user.pk)
+
+    def perform_destroy(self, instance):
+        uploads.discard(instance)
+
+    def parse_content_range(self, request):
+        match = self.content_range.match(
+            request.META.get('HTTP_CONTENT_RANGE', '')
+        )
+        if not match:
+            raise ValidationError({'Content-Range': [
+                'Укажите заголовок в формате `bytes start-end/size`.'
+            ]})
+        start, end, total = map(int, match.groups())
+        if end < start:
+            raise ValidationError({'Content-Range': ['Пустой диапазон.']})
+        return start, end, total
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        start, end, total = self.parse_content_range(request)
+        length = end - start + 1
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response(
+                {'detail': 'Часть больше UPLOAD_CHUNK_MAX_SIZE.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        if request.stream is None:
+            raise ValidationError({'detail': 'Тело запроса пустое.'})
+        upload = get_object_or_404(
+            self.get_queryset().select_for_update(), pk=kwargs['pk']
+        )
+        if total != upload.size or end >= upload.size:
+            raise ValidationError({'Content-Range': [
+                'Диапазон не соответствует размеру файла.'
+            ]})
+        if start != upload.offset:
+            return Response(
+                self.get_serializer(upload).data,
+                status=status.HTTP_409_CONFLICT
+            )
+        try:
+            uploads.write_chunk(upload, request.stream, start, length)
+            if start == 0:
+                uploads.check_header(upload)
+        except uploads.UploadError as error:
+            # Ответ, а не исключение: удаление загрузки должно остаться
+            # в транзакции.
+            if start == 0:
+                uploads.discard(upload)
+            return Response(
+                {'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        upload.offset = end + 1
+        upload.save(update_fields=('offset',))
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=('post',))
+    def complete(self, request, pk=None):
+        upload = self.get_object()
+        if upload.offset != upload.size:
+            return Response(
+                self.get_serializer(upload).data,
+                status=status.HTTP_409_CONFLICT
+            )
+        serializer = ImageUploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        post = serializer.validated_data['post']
+        if post.author_id != request.user.pk:
+            raise PermissionDenied('Изменение чужого контента запрещено!')
+        try:
+            uploads.check_image(upload)
+        except uploads.UploadError as error:
+            uploads.discard(upload)
+            raise ValidationError({'detail': str(error)})
+        uploads.attach_to_post(upload, post)
+        post.refresh_from_db(fields=('image_variants',))
+        return Response(
+            PostSerializer(post, context=self.get_serializer_context()).data
+        )
@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(using, **kwargs):
+    from django.db import connections
+
+    from .search import install_search_index
+    install_search_index(connections[using])
 
 
 class PostsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'posts'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .database import check_persistent_connections, configure_sqlite
+
+        post_migrate.connect(ensure_search_index, sender=self)
+        connection_created.connect(configure_sqlite)
+        request_started.connect(check_persistent_connections)
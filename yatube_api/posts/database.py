@@ -0,0 +1,36 @@
+"""Настройка соединений с базой данных.
+
+Для SQLite при открытии соединения применяются PRAGMA из
+settings.SQLITE_PRAGMAS: WAL (SQLITE_JOURNAL_MODE=wal) позволяет читать
+во время записи, а synchronous=normal в режиме WAL убирает fsync с каждой
+транзакции. Режим журнала сохраняется в файле базы, поэтому по умолчанию
+он не меняется.
+
+Django 3.2 не проверяет постоянные соединения (CONN_MAX_AGE) перед
+повторным использованием, поэтому для баз с CONN_HEALTH_CHECKS это
+делается в начале каждого запроса: соединение, оборванное сервером
+или пулером, закрывается и открывается заново, а не падает на первом
+запросе к базе.
+"""
+from django.conf import settings
+from django.db import connections
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def check_persistent_connections(**kwargs):
+    for connection in connections.all():
+        settings_dict = connection.settings_dict
+        if (
+            connection.connection is not None
+            and settings_dict.get('CONN_MAX_AGE')
+            and settings_dict.get('CONN_HEALTH_CHECKS')
+            and not connection.is_usable()
+        ):
+            connection.close()
@@ -0,0 +1,96 @@
+"""Ленты подписок с рассылкой при записи.
+
+Лента пользователя — список id постов (новые первыми) длиной не больше
+FEED_SIZE в кэше под ключом `feed:<user_id>`. Новый пост дописывается в
+начало лент подписчиков автора при публикации. Обновляются только
+ленты, которые уже есть в кэше. Отсутствующая лента собирается из БД
+при первом чтении и новый пост увидит сама.
+
+У автора больше FEED_FANOUT_LIMIT подписчиков рассылка не нужна: одна
+запись превратилась бы в тысячи обновлений кэша. Такие посты отмечаются
+`fanned_out=False` и при чтении ленты добираются отдельным запросом по
+частичному индексу.
+
+Обновление ленты в кэше — чтение и запись без блокировки, так что при
+одновременной публикации двух постов один может не попасть в ленту, пока
+её не пересоберут (через FEED_TIMEOUT или после подписки/отписки).
+
+С LocMemCache у каждого воркера свои ленты, и рассылка и сброс при
+подписке видны только в воркере, обработавшем запрос. Поэтому
+FEED_TIMEOUT по умолчанию — несколько минут: через этот срок лента
+в любом воркере собирается из БД заново. Долгий срок имеет смысл только
+с общим кэшем.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Follow, Post
+
+FEED_KEY = 'feed:{user_id}'
+BATCH_SIZE = 500
+
+
+def feed_key(user_id):
+    return FEED_KEY.format(user_id=user_id)
+
+
+def get_fanout_followers(author_id):
+    """Подписчики автора для рассылки или None, если их слишком много."""
+    limit = settings.FEED_FANOUT_LIMIT
+    followers = list(
+        Follow.objects.filter(following_id=author_id)
+        .values_list('user_id', flat=True)[:limit + 1]
+    )
+    return None if len(followers) > limit else followers
+
+
+def fan_out(posts, followers):
+    """Дописывает посты в начало уже собранных лент подписчиков."""
+    new_ids = sorted((post.pk for post in posts if post.pk), reverse=True)
+    if len(new_ids) < len(posts):
+        # bulk_create без RETURNING (SQLite) не отдаёт id постов:
+        # ленты подписчиков соберутся из БД заново.
+        cache.delete_many([feed_key(pk) for pk in followers])
+        return
+    for start in range(0, len(followers), BATCH_SIZE):
+        keys = [feed_key(pk) for pk in followers[start:start + BATCH_SIZE]]
+        feeds = cache.get_many(keys)
+        cache.set_many(
+            {
+                key: (new_ids + feed)[:settings.FEED_SIZE]
+                for key, feed in feeds.items()
+            },
+            settings.FEED_TIMEOUT
+        )
+
+
+def forget_feed(user_id):
+    cache.delete(feed_key(user_id))
+
+
+def get_pushed_ids(user_id):
+    key = feed_key(user_id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(
+            Post.objects.filter(
+                author__following__user_id=user_id, fanned_out=True
+            ).order_by('-id').values_list('id', flat=True)
+            [:settings.FEED_SIZE]
+        )
+        cache.set(key, ids, settings.FEED_TIMEOUT)
+    return ids
+
+
+def get_feed_ids(user_id, limit, before=None):
+    """Id постов ленты для страницы: рассылка и чтение авторов-гигантов."""
+    pushed = [
+        pk for pk in get_pushed_ids(user_id) if before is None or pk < before
+    ][:limit]
+    pulled = Post.objects.filter(
+        author__following__user_id=user_id, fanned_out=False
+    )
+    if before is not None:
+        pulled = pulled.filter(id__lt=before)
+    pulled = pulled.order_by('-id').values_list('id', flat=True)[:limit]
+    return sorted(set(pushed).union(pulled), reverse=True)[:limit]
@@ -0,0 +1,88 @@
+"""Уменьшенные копии изображений постов.
+
+Копии строятся вне запроса: `schedule_variants` после коммита транзакции
+передаёт `generate_variants` исполнителю из настройки POST_IMAGE_RUNNER —
+пулу потоков процесса по умолчанию, синхронному вызову или внешней
+очереди задач.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+from PIL import Image
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def run_inline(func, *args):
+    func(*args)
+
+
+def run_in_thread_pool(func, *args):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.POST_IMAGE_WORKERS,
+            thread_name_prefix='post-images'
+        )
+    _executor.submit(_run_with_connections, func, *args)
+
+
+def _run_with_connections(func, *args):
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Не удалось построить копии изображения поста')
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(post_id):
+    runner = import_string(settings.POST_IMAGE_RUNNER)
+    transaction.on_commit(lambda: runner(generate_variants, post_id))
+
+
+def variant_name(name, variant):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return f'posts/variants/{stem}_{variant}.jpg'
+
+
+def generate_variants(post_id):
+    post = Post.objects.filter(pk=post_id).only('image', 'image_variants')
+    post = post.first()
+    if post is None or not post.image:
+        return
+    storage = post.image.storage
+    with post.image.open('rb') as file:
+        original = Image.open(file)
+        original.load()
+    if original.mode not in ('RGB', 'L'):
+        original = original.convert('RGB')
+
+    variants = {}
+    for variant, size in settings.POST_IMAGE_VARIANTS.items():
+        image = original.copy()
+        image.thumbnail(size)
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', quality=85, optimize=True)
+        name = variant_name(post.image.name, variant)
+        storage.delete(name)
+        variants[variant] = storage.save(name, ContentFile(buffer.getvalue()))
+
+    image_name = post.image.name
+    post.refresh_from_db(fields=('image',))
+    if post.image.name != image_name:
+        # Пока строились копии, изображение заменили: их построит новая задача.
+        return
+    post.image_variants = variants
+    post.save(update_fields=('image_variants',))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.models import Group
+from posts.signals import refresh_group_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает post_count, comment_count и last_activity групп.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество групп, обновляемых в одной транзакции.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(
+                Group.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                refresh_group_stats(batch)
+            updated += len(batch)
+            last_pk = batch[-1]
+        self.stdout.write(f'Обновлено групп: {updated}')
@@ -0,0 +1,77 @@
+# Generated by Django 3.2 on 2026-10-18 18:16
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    posts = Post.objects.filter(group=OuterRef('pk'))
+    comments = Comment.objects.filter(post__group=OuterRef('pk'))
+    last_post = Subquery(posts.order_by('-pub_date').values('pub_date')[:1])
+    last_comment = Subquery(
+        comments.order_by('-created').values('created')[:1]
+    )
+    Group.objects.update(
+        post_count=Coalesce(
+            Subquery(
+                posts.values('group')
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            0
+        ),
+        comment_count=Coalesce(
+            Subquery(
+                comments.values('post__group')
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            0
+        ),
+        last_activity=Greatest(
+            Coalesce(last_post, last_comment),
+            Coalesce(last_comment, last_post)
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_follow_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_activity',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество постов'),
+        ),
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['post_count', 'id'], name='group_post_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['comment_count', 'id'], name='group_comment_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['last_activity', 'id'], name='group_last_activity_idx'),
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
@@ -1,18 +1,104 @@
+import uuid
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
 
 User = get_user_model()
 
 
+class GroupQuerySet(models.QuerySet):
+    def refresh_stats(self):
+        """Пересчитывает счётчики постов, комментариев и дату активности."""
+        posts = Post.objects.filter(group=OuterRef('pk'))
+        comments = Comment.objects.filter(post__group=OuterRef('pk'))
+        last_post = Subquery(
+            posts.order_by('-pub_date').values('pub_date')[:1]
+        )
+        last_comment = Subquery(
+            comments.order_by('-created').values('created')[:1]
+        )
+        return self.update(
+            post_count=Coalesce(
+                Subquery(
+                    posts.values('group')
+                    .annotate(total=Count('id'))
+                    .values('total')
+                ),
+                0
+            ),
+            comment_count=Coalesce(
+                Subquery(
+                    comments.values('post__group')
+                    .annotate(total=Count('id'))
+                    .values('total')
+                ),
+                0
+            ),
+            # GREATEST в SQLite возвращает NULL, если NULL хотя бы один
+            # аргумент, поэтому пустые значения подменяются соседними.
+            last_activity=Greatest(
+                Coalesce(last_post, last_comment),
+                Coalesce(last_comment, last_post)
+            ),
+        )
+
+
 class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     description = models.TextField()
+    post_count = models.PositiveIntegerField(
+        'Количество постов', default=0
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0
+    )
+    last_activity = models.DateTimeField(
+        'Последняя активность', null=True, blank=True
+    )
+
+    objects = GroupQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('post_count', 'id'), name='group_post_count_idx'
+            ),
+            models.Index(
+                fields=('comment_count', 'id'),
+                name='group_comment_count_idx'
+            ),
+            models.Index(
+                fields=('last_activity', 'id'),
+                name='group_last_activity_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:20]
 
 
+class PostQuerySet(models.QuerySet):
+    def refresh_comment_stats(self):
+        """Пересчитывает счётчик и дату последнего комментария."""
+        comments = Comment.objects.filter(post=OuterRef('pk'))
+        return self.update(
+            comment_count=Coalesce(
+                Subquery(
+                    comments.values('post')
+                    .annotate(total=Count('id'))
+                    .values('total')
+                ),
+                0
+            ),
+            last_commented_at=Subquery(
+                comments.order_by('-created').values('created')[:1]
+            ),
+        )
+
+
 class Post(models.Model):
     text = models.TextField()
     pub_date = models.DateTimeField(
@@ -24,10 +110,45 @@ class Post(models.Model):
     image = models.ImageField(
         upload_to='posts/', null=True, blank=True
     )
+    image_variants = models.JSONField(
+        'Уменьшенные копии изображения', default=dict, blank=True,
+        editable=False
+    )
     group = models.ForeignKey(
         Group, on_delete=models.SET_NULL,
         related_name='posts', blank=True, null=True
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0
+    )
+    last_commented_at = models.DateTimeField(
+        'Дата последнего комментария', null=True, blank=True
+    )
+    fanned_out = models.BooleanField(
+        'Разослан в ленты подписчиков', default=True, editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'), name='post_pub_date_id_idx'
+            ),
+            models.Index(
+                fields=('group', 'pub_date'), name='post_group_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            # Посты авторов с большим числом подписчиков читаются в ленты
+            # запросом (см. posts.feeds), остальные сюда не попадают.
+            models.Index(
+                fields=('author', 'id'), name='post_pull_feed_idx',
+                condition=models.Q(fanned_out=False)
+            ),
+        )
 
     def __str__(self):
         return self.title[:20]
@@ -45,5 +166,52 @@ class Comment(models.Model):
         'Дата добавления', auto_now_add=True, db_index=True
     )
 
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('post', 'created', 'id'),
+                name='comment_post_created_id_idx'
+            ),
+        )
+
     def __str__(self):
         return self.title[:20]
+
+
+class ImageUpload(models.Model):
+    """Незавершённая загрузка изображения частями."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='image_uploads'
+    )
+    filename = models.CharField('Имя файла', max_length=255)
+    size = models.PositiveBigIntegerField('Размер файла')
+    offset = models.PositiveBigIntegerField('Получено байт', default=0)
+    created = models.DateTimeField('Дата начала', auto_now_add=True)
+
+    def __str__(self):
+        return self.filename[:20]
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='follower'
+    )
+    following = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='following'
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'following'), name='unique_follow'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('following')),
+                name='no_self_follow'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user} -> {self.following}'
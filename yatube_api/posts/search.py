@@ -0,0 +1,103 @@
+"""Полнотекстовый поиск по тексту постов.
+
+На SQLite используется внешняя FTS5-таблица, синхронизируемая триггерами,
+на PostgreSQL — GIN-индекс по `to_tsvector`. Для остальных СУБД поиск
+сводится к `icontains`.
+"""
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'russian'
+
+SQLITE_TABLE = 'posts_post_fts'
+SQLITE_INSTALL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} USING fts5('
+    "text, content='posts_post', content_rowid='id')",
+    f'CREATE TRIGGER IF NOT EXISTS {SQLITE_TABLE}_ai '
+    'AFTER INSERT ON posts_post BEGIN '
+    f'INSERT INTO {SQLITE_TABLE}(rowid, text) VALUES (new.id, new.text); '
+    'END',
+    f'CREATE TRIGGER IF NOT EXISTS {SQLITE_TABLE}_ad '
+    'AFTER DELETE ON posts_post BEGIN '
+    f'INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}, rowid, text) '
+    "VALUES ('delete', old.id, old.text); "
+    'END',
+    f'CREATE TRIGGER IF NOT EXISTS {SQLITE_TABLE}_au '
+    'AFTER UPDATE OF text ON posts_post BEGIN '
+    f'INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}, rowid, text) '
+    "VALUES ('delete', old.id, old.text); "
+    f'INSERT INTO {SQLITE_TABLE}(rowid, text) VALUES (new.id, new.text); '
+    'END',
+)
+SQLITE_REBUILD = (
+    f"INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}) VALUES ('rebuild')"
+)
+SQLITE_UNINSTALL = (
+    f'DROP TRIGGER IF EXISTS {SQLITE_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {SQLITE_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {SQLITE_TABLE}_au',
+    f'DROP TABLE IF EXISTS {SQLITE_TABLE}',
+)
+
+POSTGRESQL_INDEX = 'posts_post_text_fts_idx'
+POSTGRESQL_MATCH = (
+    f"to_tsvector('{SEARCH_CONFIG}', posts_post.text) "
+    f"@@ plainto_tsquery('{SEARCH_CONFIG}', %s)"
+)
+POSTGRESQL_INSTALL = (
+    f'CREATE INDEX IF NOT EXISTS {POSTGRESQL_INDEX} ON posts_post '
+    f"USING GIN (to_tsvector('{SEARCH_CONFIG}', text))",
+)
+POSTGRESQL_UNINSTALL = (f'DROP INDEX IF EXISTS {POSTGRESQL_INDEX}',)
+
+
+def _execute(connection, statements):
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_index(connection, rebuild=False):
+    """Создаёт индекс, если его нет.
+
+    На SQLite пересоздание таблицы `posts_post` миграцией удаляет
+    триггеры, поэтому функция вызывается и после каждого `migrate`.
+    """
+    if connection.vendor == 'sqlite':
+        _execute(connection, SQLITE_INSTALL)
+        if rebuild:
+            _execute(connection, (SQLITE_REBUILD,))
+    elif connection.vendor == 'postgresql':
+        _execute(connection, POSTGRESQL_INSTALL)
+
+
+def uninstall_search_index(connection):
+    if connection.vendor == 'sqlite':
+        _execute(connection, SQLITE_UNINSTALL)
+    elif connection.vendor == 'postgresql':
+        _execute(connection, POSTGRESQL_UNINSTALL)
+
+
+def search_posts(queryset, query):
+    """Оставляет в queryset посты, содержащие все слова из query."""
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"' for term in terms)
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {SQLITE_TABLE} '
+            f'WHERE {SQLITE_TABLE} MATCH %s',
+            (match,)
+        ))
+    if vendor == 'postgresql':
+        return queryset.extra(
+            where=[POSTGRESQL_MATCH],
+            params=[' '.join(terms)],
+        )
+    for term in terms:
+        queryset = queryset.filter(text__icontains=term)
+    return queryset
@@ -0,0 +1,172 @@
+"""Счётчики групп (post_count, comment_count, last_activity) и постов
+(comment_count, last_commented_at).
+
+Обновляются атомарно через F() по сигналам постов и комментариев.
+Массовые операции без сигналов (bulk_create, update) пересчитывают
+группы через `refresh_group_stats`, а расхождения исправляет команда
+`reconcile_group_stats`. После фиксации транзакции с изменением
+отправляется `group_stats_changed` со списком id групп.
+
+Комментарии, удаляемые каскадом вместе с постом или автором, не
+обрабатываются по одному: счётчики пересчитываются один раз на пост
+или автора, а сигнал каждого комментария пропускается.
+"""
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import Signal, receiver
+
+from .models import Comment, Group, Post, User
+
+group_stats_changed = Signal()
+
+# Посты и авторы, чьи комментарии сейчас удаляются каскадом.
+deleting_posts = ContextVar('deleting_posts', default=frozenset())
+deleting_authors = ContextVar('deleting_authors', default=frozenset())
+
+
+def send_group_stats_changed(group_ids):
+    transaction.on_commit(lambda: group_stats_changed.send(
+        sender=Group, group_ids=group_ids
+    ))
+
+
+def change_group_stats(group_id, posts=0, comments=0, activity=None):
+    # Счётчики не опускаются ниже нуля: после массовых операций без
+    # сигналов они могут расходиться с БД до `reconcile_group_stats`.
+    changes = {
+        'post_count': Greatest(F('post_count') + posts, Value(0)),
+        'comment_count': Greatest(F('comment_count') + comments, Value(0)),
+    }
+    if activity is not None:
+        changes['last_activity'] = Greatest(
+            Coalesce('last_activity', Value(activity)), Value(activity)
+        )
+    Group.objects.filter(pk=group_id).update(**changes)
+    send_group_stats_changed([group_id])
+
+
+def refresh_group_stats(group_ids):
+    group_ids = [pk for pk in set(group_ids) if pk is not None]
+    if group_ids:
+        Group.objects.filter(pk__in=group_ids).refresh_stats()
+        send_group_stats_changed(group_ids)
+
+
+def get_post_group_id(post_id):
+    return Post.objects.filter(pk=post_id).values_list(
+        'group_id', flat=True
+    ).first()
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_group(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (
+        update_fields is not None and 'group' not in update_fields
+    ):
+        return
+    instance._saved_group = Post.objects.filter(pk=instance.pk).values_list(
+        'group_id', 'comment_count'
+    ).first()
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, **kwargs):
+    if created:
+        if instance.group_id:
+            change_group_stats(
+                instance.group_id, posts=1, activity=instance.pub_date
+            )
+        return
+    saved = instance.__dict__.pop('_saved_group', None)
+    if saved is None or saved[0] == instance.group_id:
+        return
+    old_group_id, comment_count = saved
+    if old_group_id:
+        change_group_stats(old_group_id, posts=-1, comments=-comment_count)
+    if instance.group_id:
+        change_group_stats(
+            instance.group_id, posts=1, comments=comment_count,
+            activity=instance.last_commented_at or instance.pub_date
+        )
+
+
+@receiver(pre_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    # Комментарии поста удаляются каскадом раньше него: группа уменьшается
+    # на все их сразу, а не сигналом каждого комментария.
+    deleting_posts.set(deleting_posts.get() | {instance.pk})
+    if instance.group_id:
+        change_group_stats(
+            instance.group_id, posts=-1,
+            comments=-Comment.objects.filter(post=instance).count()
+        )
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    deleting_posts.set(deleting_posts.get() - {instance.pk})
+
+
+@receiver(pre_delete, sender=User)
+def remember_commented_posts(sender, instance, **kwargs):
+    # Свои посты автора удаляются каскадом и считаются выше; чужие посты
+    # с его комментариями пересчитываются после удаления.
+    deleting_authors.set(deleting_authors.get() | {instance.pk})
+    instance._commented_posts = list(
+        Post.objects.filter(comments__author=instance)
+        .exclude(author=instance)
+        .values_list('pk', 'group_id')
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_author(sender, instance, **kwargs):
+    deleting_authors.set(deleting_authors.get() - {instance.pk})
+    posts = instance.__dict__.pop('_commented_posts', ())
+    if posts:
+        Post.objects.filter(
+            pk__in=[pk for pk, _ in posts]
+        ).refresh_comment_stats()
+        refresh_group_stats(group_id for _, group_id in posts)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    if not created:
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=F('comment_count') + 1,
+        last_commented_at=Greatest(
+            Coalesce('last_commented_at', Value(instance.created)),
+            Value(instance.created)
+        ),
+    )
+    group_id = get_post_group_id(instance.post_id)
+    if group_id:
+        change_group_stats(group_id, comments=1, activity=instance.created)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if (
+        instance.post_id in deleting_posts.get()
+        or instance.author_id in deleting_authors.get()
+    ):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, Value(0)),
+        last_commented_at=Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by('-created').values('created')[:1]
+        ),
+    )
+    group_id = get_post_group_id(instance.post_id)
+    if group_id:
+        change_group_stats(group_id, comments=-1)
@@ -0,0 +1,81 @@
+"""Загрузка изображений частями с возможностью продолжения.
+
+Части пишутся сразу в файл `uploads/<id>.part` хранилища по своему
+смещению, так что память на запрос ограничена размером блока чтения.
+Хранилище должно быть локальным (FileSystemStorage); готовый файл
+передаётся в ImageField поста обычным сохранением через хранилище.
+"""
+import os
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from .images import schedule_variants
+
+READ_BLOCK_SIZE = 64 * 1024
+ALLOWED_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+ALLOWED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+class UploadError(Exception):
+    pass
+
+
+def part_path(upload):
+    path = default_storage.path(f'uploads/{upload.pk}.part')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def write_chunk(upload, stream, start, length):
+    """Пишет length байт из stream в файл загрузки начиная со start."""
+    path = part_path(upload)
+    mode = 'r+b' if os.path.exists(path) else 'wb'
+    written = 0
+    with open(path, mode) as file:
+        file.seek(start)
+        while written < length:
+            block = stream.read(min(READ_BLOCK_SIZE, length - written))
+            if not block:
+                break
+            file.write(block)
+            written += len(block)
+    if written != length:
+        raise UploadError('Получено меньше данных, чем указано в запросе.')
+
+
+def check_header(upload):
+    """Проверяет по первым байтам, что загружается изображение."""
+    try:
+        with Image.open(part_path(upload)) as image:
+            image_format = image.format
+    except Exception:
+        raise UploadError('Файл не является изображением.')
+    if image_format not in ALLOWED_FORMATS:
+        raise UploadError(f'Формат {image_format} не поддерживается.')
+
+
+def check_image(upload):
+    try:
+        with Image.open(part_path(upload)) as image:
+            image.verify()
+    except Exception:
+        raise UploadError('Файл изображения повреждён.')
+
+
+def discard(upload):
+    path = part_path(upload)
+    if os.path.exists(path):
+        os.remove(path)
+    upload.delete()
+
+
+def attach_to_post(upload, post):
+    """Сохраняет загруженный файл как изображение поста."""
+    with open(part_path(upload), 'rb') as file:
+        post.image.save(upload.filename, File(file), save=False)
+    post.image_variants = {}
+    post.save(update_fields=('image', 'image_variants'))
+    schedule_variants(post.pk)
+    discard(upload)
@@ -1,9 +1,16 @@
 """Django settings for yatube project."""
 
+import os
+from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+from dotenv import load_dotenv
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+load_dotenv(BASE_DIR / '.env')
+
 
 SECRET_KEY = 'm%(5u7nv9j2%@3xb%#c3p-$9&0$kq$j6l@9+@ogairu48a+dy+'
 
@@ -31,6 +38,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.middleware.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -54,15 +62,102 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'yatube_api.wsgi.application'
+ASGI_APPLICATION = 'yatube_api.asgi.application'
+
+# Асинхронные view API; включается в asgi.py.
+API_ASYNC_VIEWS = os.getenv('API_ASYNC_VIEWS', 'false').lower() == 'true'
+
+
+if os.getenv('DB_ENGINE', 'sqlite') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'yatube'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # Сколько секунд ждать снятия блокировки записи (busy timeout).
+            'OPTIONS': {'timeout': int(os.getenv('SQLITE_TIMEOUT', 20))},
+        }
+    }
 
+# Реплики только для чтения: через запятую файлы SQLite или хосты PostgreSQL.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    alias = f'replica_{number}'
+    location = 'NAME' if 'sqlite' in DATABASES['default']['ENGINE'] else 'HOST'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        location: replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['api.db_routers.ReplicaRouter']
+REPLICA_PIN_TIMEOUT = int(os.getenv('REPLICA_PIN_TIMEOUT', 5))
+
+# journal_mode сохраняется в самом файле базы, поэтому WAL включается только
+# явно (SQLITE_JOURNAL_MODE=wal): иначе любой запуск manage.py переводил бы
+# в WAL отслеживаемый в git db.sqlite3.
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE')
+SQLITE_PRAGMAS = {
+    'synchronous': 'normal',
+    'temp_store': 'memory',
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+}
+if SQLITE_JOURNAL_MODE:
+    SQLITE_PRAGMAS = {'journal_mode': SQLITE_JOURNAL_MODE, **SQLITE_PRAGMAS}
 
-DATABASES = {
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'yatube'),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 10000)),
+        },
     }
 }
 
+# Закрепление клиента за основной базой после записи (ReplicaMiddleware)
+# хранится в кэше: с кэшем в памяти процесса следующий запрос в другой
+# воркер о нём не узнает и прочитает отстающую реплику.
+if DATABASE_REPLICAS and CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+):
+    raise ImproperlyConfigured(
+        'DB_REPLICAS требует общего кэша: задайте CACHE_BACKEND '
+        '(Redis, Memcached или база данных).'
+    )
+
+# Списки групп сбрасываются только при изменении самих групп; счётчики
+# постов и комментариев в них отстают не больше чем на этот срок.
+GROUPS_CACHE_TIMEOUT = int(os.getenv('GROUPS_CACHE_TIMEOUT', 600))
+# Срок жизни меток изменений для ETag/Last-Modified. LocMemCache у каждого
+# процесса свой: чужой воркер узнаёт об изменении не позже этого срока.
+# С общим кэшем (CACHE_BACKEND=Redis/Memcached) срок можно увеличить.
+API_VERSION_TIMEOUT = int(os.getenv('API_VERSION_TIMEOUT', 30))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -96,12 +191,73 @@ STATIC_URL = '/static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+POST_IMAGE_VARIANTS = {
+    'thumbnail': (200, 200),
+    'medium': (800, 800),
+}
+POST_IMAGE_RUNNER = os.getenv(
+    'POST_IMAGE_RUNNER', 'posts.images.run_in_thread_pool'
+)
+POST_IMAGE_WORKERS = int(os.getenv('POST_IMAGE_WORKERS', 2))
+
+UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', 50 * 1024 * 1024))
+UPLOAD_CHUNK_MAX_SIZE = int(
+    os.getenv('UPLOAD_CHUNK_MAX_SIZE', 5 * 1024 * 1024)
+)
+
+
+FEED_SIZE = int(os.getenv('FEED_SIZE', 500))
+FEED_FANOUT_LIMIT = int(os.getenv('FEED_FANOUT_LIMIT', 1000))
+# Ленты лежат в кэше по умолчанию; у LocMemCache он свой у каждого воркера,
+# и рассылка обновляет ленты только в своём. Короткий срок ограничивает,
+# как долго ленты в других воркерах остаются устаревшими. С общим кэшем
+# (CACHE_BACKEND=Redis/Memcached) срок можно увеличить до часов и суток.
+FEED_TIMEOUT = int(os.getenv('FEED_TIMEOUT', 5 * 60))
+
+API_BULK_CREATE_LIMIT = int(os.getenv('API_BULK_CREATE_LIMIT', 1000))
+API_BATCH_IDS_LIMIT = int(os.getenv('API_BATCH_IDS_LIMIT', 100))
+
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+TOKEN_CACHE_TIMEOUT = int(os.getenv('TOKEN_CACHE_TIMEOUT', 60))
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.TokenAuthentication',
+        'rest_framework_simplejwt.authentication.JWTTokenUserAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'api.renderers.CompactJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.AnonBucketThrottle',
+        'api.throttling.UserBucketThrottle',
+        'api.throttling.WriteBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': os.getenv('THROTTLE_ANON_RATE', '60/min'),
+        'user': os.getenv('THROTTLE_USER_RATE', '600/min'),
+        'write': os.getenv('THROTTLE_WRITE_RATE', '120/min'),
+        'upload': os.getenv('THROTTLE_UPLOAD_RATE', '1200/min'),
+    },
+}
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(
+        minutes=int(os.getenv('JWT_ACCESS_MINUTES', 5))
+    ),
+    'REFRESH_TOKEN_LIFETIME': timedelta(
+        days=int(os.getenv('JWT_REFRESH_DAYS', 1))
+    ),
+    'AUTH_HEADER_TYPES': ('Bearer',),
 }